@@ -5,6 +5,9 @@
 #              are available and how they're implemented.
 #              Don't modify the contents of this file.
 
+from bisect import bisect_left
+from itertools import compress
+
 
 # -------------- Used by both HashMaps (SC & OA)  -------------- #
 
@@ -16,26 +19,33 @@ class DynamicArray:
     """
     Class implementing a Dynamic Array
     Supported methods are:
-    append, pop, swap, get_at_index, set_at_index, length
+    append, extend, fill, pop, swap, get_at_index, set_at_index, length,
+    slicing with [start:stop:step] and iteration
     """
 
-    def __init__(self, arr=None) -> None:
-        """Initialize new dynamic array using a list."""
-        self._data = arr.copy() if arr else []
+    __slots__ = ('_data',)
+
+    def __init__(self, arr=None, length: int = 0, fill: object = None) -> None:
+        """
+        Initialize new dynamic array using a list,
+        or preallocate length elements all set to fill in one step.
+        """
+        self._data = arr.copy() if arr else [fill] * length
 
     def __iter__(self):
         """
-        Disable iterator capability for DynamicArray class
-        This means loops and aggregate functions like
-        those shown below won't work:
+        Iterate over the elements of the array, in index order.
+        Loops and aggregate functions like those below go straight to the underlying list:
 
         da = DynamicArray()
-        for value in da:        # will not work
-        min(da)                 # will not work
-        max(da)                 # will not work
-        sort(da)                # will not work
+        for value in da:
+        min(da)
         """
-        return None
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        """Return length of array."""
+        return len(self._data)
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
@@ -45,6 +55,14 @@ class DynamicArray:
         """Add new element at the end of the array."""
         self._data.append(value)
 
+    def extend(self, values) -> None:
+        """Add every element of an iterable at the end of the array."""
+        self._data.extend(values)
+
+    def fill(self, value: object) -> None:
+        """Set every element of the array to value, keeping its length."""
+        self._data = [value] * len(self._data)
+
     def pop(self):
         """Remove element from end of the array and return it."""
         return self._data.pop()
@@ -59,9 +77,20 @@ class DynamicArray:
             raise DynamicArrayException
         return self._data[index]
 
-    def __getitem__(self, index: int):
-        """Return value of element at a given index using [] syntax."""
-        return self.get_at_index(index)
+    def __getitem__(self, index):
+        """
+        Return value of element at a given index using [] syntax,
+        or a list of the elements in a slice.
+        Bounds are checked inline, without going through get_at_index.
+        """
+        try:
+            if 0 <= index < len(self._data):
+                return self._data[index]
+        except TypeError:
+            if isinstance(index, slice):
+                return self._data[index]
+            raise
+        raise DynamicArrayException
 
     def set_at_index(self, index: int, value: object) -> None:
         """Set value of element at a given index."""
@@ -71,7 +100,9 @@ class DynamicArray:
 
     def __setitem__(self, index: int, value: object) -> None:
         """Set value of element at a given index using [] syntax."""
-        self.set_at_index(index, value)
+        if index < 0 or index >= len(self._data):
+            raise DynamicArrayException
+        self._data[index] = value
 
     def length(self) -> int:
         """Return length of array."""
@@ -96,6 +127,110 @@ def hash_function_2(key: str) -> int:
     return hash
 
 
+def hash_function_fnv1a(key: str) -> int:
+    """
+    64-bit FNV-1a hash over the UTF-8 bytes of the key.
+    A distribution reference only, not a fast option: FNV-1a has no C implementation in the standard
+    library, so this loops over every byte in Python and is the slowest of the hash functions here.
+    For speed use hash_function_polynomial or hash_function_builtin.
+    """
+    hash = 0xcbf29ce484222325
+    for byte in key.encode():
+        hash = ((hash ^ byte) * 0x100000001b3) & 0xFFFFFFFFFFFFFFFF
+    return hash
+
+
+def hash_function_polynomial(key: str) -> int:
+    """
+    Polynomial hash of the key's UTF-8 bytes in base 256, modulo the Mersenne prime 2^61 - 1.
+    int.from_bytes evaluates the polynomial in C, so there is no Python loop per character.
+    """
+    return int.from_bytes(key.encode(), 'little') % 0x1FFFFFFFFFFFFFFF
+
+
+def hash_function_builtin(key: str) -> int:
+    """
+    Python's own hash of the key, folded to a non-negative 64-bit value.
+    String hashes are salted per process, so values differ between runs.
+    """
+    return hash(key) & 0xFFFFFFFFFFFFFFFF
+
+
+def mix_hash(hash: int) -> int:
+    """
+    64-bit finalizer from MurmurHash3 (fmix64). Every input bit affects the low bits of the result,
+    so a power-of-two table can index with a bitmask even when the hash function is weak.
+    """
+    hash &= 0xFFFFFFFFFFFFFFFF
+    hash ^= hash >> 33
+    hash = (hash * 0xff51afd7ed558ccd) & 0xFFFFFFFFFFFFFFFF
+    hash ^= hash >> 33
+    hash = (hash * 0xc4ceb9fe1a85ec53) & 0xFFFFFFFFFFFFFFFF
+    hash ^= hash >> 33
+    return hash
+
+
+# ------------ Prime capacities for both HashMaps  ------------ #
+
+# Sieve of Eratosthenes below _SIEVE_LIMIT, so capacities for small and medium maps
+# are a table lookup instead of trial division.
+_SIEVE_LIMIT = 1 << 16
+_SIEVE = bytearray([1]) * _SIEVE_LIMIT
+_SIEVE[0] = _SIEVE[1] = 0
+for _factor in range(2, int(_SIEVE_LIMIT ** 0.5) + 1):
+    if _SIEVE[_factor]:
+        _SIEVE[_factor * _factor::_factor] = bytes(len(range(_factor * _factor, _SIEVE_LIMIT, _factor)))
+_ODD_PRIMES = list(compress(range(_SIEVE_LIMIT), _SIEVE))[1:]
+
+
+def is_prime(capacity: int) -> bool:
+    """
+    Determine if given integer is a prime number and return boolean.
+    Uses the sieve table when it covers the number, and a deterministic Miller-Rabin test otherwise.
+    """
+    if capacity < _SIEVE_LIMIT:
+        return capacity >= 0 and _SIEVE[capacity] == 1
+
+    if capacity % 2 == 0:
+        return False
+
+    d, r = capacity - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        r += 1
+
+    # these bases give a deterministic answer for every capacity below 3.3 * 10^24
+    for base in (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37):
+        x = pow(base, d, capacity)
+        if x == 1 or x == capacity - 1:
+            continue
+        for _ in range(r - 1):
+            x = x * x % capacity
+            if x == capacity - 1:
+                break
+        else:
+            return False
+
+    return True
+
+
+def next_prime(capacity: int) -> int:
+    """
+    Return the smallest odd prime number greater than or equal to the given integer.
+    """
+    index = bisect_left(_ODD_PRIMES, capacity)
+    if index < len(_ODD_PRIMES):
+        return _ODD_PRIMES[index]
+
+    if capacity % 2 == 0:
+        capacity += 1
+
+    while not is_prime(capacity):
+        capacity += 2
+
+    return capacity
+
+
 # --------- For use in Separate Chaining (SC) HashMap  --------- #
 
 class SLNode:
@@ -103,11 +238,14 @@ class SLNode:
     Singly Linked List node for use in a hash map
     """
 
-    def __init__(self, key: str, value: object, next: "SLNode" = None) -> None:
-        """Initialize node given a key and value."""
+    __slots__ = ('key', 'value', 'next', 'hash')
+
+    def __init__(self, key: str, value: object, next: "SLNode" = None, hash: int = None) -> None:
+        """Initialize node given a key and value, and optionally the key's cached hash."""
         self.key = key
         self.value = value
         self.next = next
+        self.hash = hash
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
@@ -119,6 +257,8 @@ class LinkedListIterator:
     Separate iterator class for LinkedList
     """
 
+    __slots__ = ('_node',)
+
     def __init__(self, current_node: SLNode) -> None:
         """Initialize the iterator with a node."""
         self._node = current_node
@@ -141,9 +281,12 @@ class LinkedListIterator:
 class LinkedList:
     """
     Class implementing a Singly Linked List
-    Supported methods are: insert, remove, contains, length, iterator
+    Supported methods are: insert, update_or_append, find_or_append, remove, unlink,
+    contains, move_to_front, length, iterator
     """
 
+    __slots__ = ('_head', '_size')
+
     def __init__(self) -> None:
         """
         Initialize new linked list;
@@ -168,52 +311,225 @@ class LinkedList:
         """Return an iterator for the list, starting at the head."""
         return LinkedListIterator(self._head)
 
-    def insert(self, key: str, value: object) -> None:
+    def insert(self, key: str, value: object, hash: int = None) -> None:
         """Insert new node at front of the list."""
-        self._head = SLNode(key, value, self._head)
+        self._head = SLNode(key, value, self._head, hash)
+        self._size += 1
+
+    def update_or_append(self, key: str, value: object, hash: int = None) -> bool:
+        """
+        Update the value of the node with matching key in place, or add a new node at the end of
+        the list, in a single walk. Return True if a node was added, False if one was updated.
+        """
+        previous, node = None, self._head
+        while node:
+            if (hash is None or node.hash == hash) and node.key == key:
+                node.value = value
+                return False
+            previous, node = node, node.next
+
+        if previous:
+            previous.next = SLNode(key, value, None, hash)
+        else:
+            self._head = SLNode(key, value, None, hash)
+        self._size += 1
+        return True
+
+    def find_or_append(self, key: str, value: object, hash: int = None) -> SLNode:
+        """
+        Return the node with matching key, or add a new node holding value at the end of the list
+        and return None, in a single walk.
+        """
+        previous, node = None, self._head
+        while node:
+            if (hash is None or node.hash == hash) and node.key == key:
+                return node
+            previous, node = node, node.next
+
+        if previous:
+            previous.next = SLNode(key, value, None, hash)
+        else:
+            self._head = SLNode(key, value, None, hash)
+        self._size += 1
+        return None
+
+    def insert_node(self, node: SLNode) -> None:
+        """Link an existing node in at the front of the list."""
+        node.next = self._head
+        self._head = node
         self._size += 1
 
-    def remove(self, key: str) -> bool:
+    def remove(self, key: str, hash: int = None) -> bool:
         """
         Remove first node with matching key.
+        Given the key's hash, nodes with a different cached hash are skipped without comparing keys.
         Return True if removal was successful, False otherwise.
         """
+        return self.unlink(key, hash) is not None
+
+    def unlink(self, key: str, hash: int = None) -> SLNode:
+        """
+        Remove first node with matching key and return it, or None if no match.
+        Given the key's hash, nodes with a different cached hash are skipped without comparing keys.
+        """
         previous, node = None, self._head
         while node:
 
-            if node.key == key:
+            if (hash is None or node.hash == hash) and node.key == key:
                 if previous:
                     previous.next = node.next
                 else:
                     self._head = node.next
+                node.next = None
                 self._size -= 1
-                return True
+                return node
 
             previous, node = node, node.next
-        return False
+        return None
 
-    def contains(self, key: str) -> SLNode:
-        """Return node with matching key, or None if no match"""
+    def contains(self, key: str, hash: int = None) -> SLNode:
+        """
+        Return node with matching key, or None if no match.
+        Given the key's hash, nodes with a different cached hash are skipped without comparing keys.
+        """
         node = self._head
         while node:
-            if node.key == key:
+            if (hash is None or node.hash == hash) and node.key == key:
                 return node
             node = node.next
         return node
 
+    def move_to_front(self, key: str, hash: int = None) -> SLNode:
+        """
+        Return node with matching key after moving it to the front of the list,
+        or None if no match.
+        """
+        previous, node = None, self._head
+        while node:
+            if (hash is None or node.hash == hash) and node.key == key:
+                if previous:
+                    previous.next = node.next
+                    node.next = self._head
+                    self._head = node
+                return node
+            previous, node = node, node.next
+        return None
+
     def length(self) -> int:
         """Return the length of the list."""
         return self._size
 
 
+class SortedBucket:
+    """
+    Bucket for long chains: nodes are kept sorted by (hash, key), so lookups
+    bisect instead of walking the chain. Supports the same methods as LinkedList,
+    but every lookup needs the key's hash, and the keys in one bucket must all be
+    strs, or of some other single totally ordered type. A key that cannot be
+    ordered against them is simply not found.
+    """
+
+    __slots__ = ('_order', '_nodes')
+
+    def __init__(self, nodes=()) -> None:
+        """Initialize the bucket with the given nodes, e.g. those of a LinkedList."""
+        self._nodes = sorted(nodes, key=lambda node: (node.hash, node.key))
+        self._order = [(node.hash, node.key) for node in self._nodes]
+        for node in self._nodes:
+            node.next = None
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return 'SORTED [' + ' -> '.join(str(node) for node in self._nodes) + ']'
+
+    def __iter__(self):
+        """Return an iterator over the nodes, in (hash, key) order."""
+        return iter(self._nodes)
+
+    def _position(self, key: str, hash: int) -> int:
+        """Return the index of the node with matching key, or -1 if no match."""
+        try:
+            index = bisect_left(self._order, (hash, key))
+        except TypeError:
+            # a key that does not order against the stored ones cannot be equal to any of them
+            return -1
+        if index < len(self._order) and self._order[index] == (hash, key):
+            return index
+        return -1
+
+    def insert_node(self, node: SLNode) -> None:
+        """Add an existing node in sorted position."""
+        index = bisect_left(self._order, (node.hash, node.key))
+        self._order.insert(index, (node.hash, node.key))
+        self._nodes.insert(index, node)
+        node.next = None
+
+    def insert(self, key: str, value: object, hash: int) -> None:
+        """Add a new node in sorted position."""
+        self.insert_node(SLNode(key, value, None, hash))
+
+    def update_or_append(self, key: str, value: object, hash: int) -> bool:
+        """
+        Update the value of the node with matching key, or add a new node.
+        Return True if a node was added, False if one was updated.
+        """
+        index = self._position(key, hash)
+        if index >= 0:
+            self._nodes[index].value = value
+            return False
+        self.insert(key, value, hash)
+        return True
+
+    def find_or_append(self, key: str, value: object, hash: int) -> SLNode:
+        """
+        Return the node with matching key, or add a new node holding value and return None.
+        """
+        index = self._position(key, hash)
+        if index >= 0:
+            return self._nodes[index]
+        self.insert(key, value, hash)
+        return None
+
+    def unlink(self, key: str, hash: int) -> SLNode:
+        """Remove node with matching key and return it, or None if no match."""
+        index = self._position(key, hash)
+        if index < 0:
+            return None
+        del self._order[index]
+        return self._nodes.pop(index)
+
+    def remove(self, key: str, hash: int) -> bool:
+        """
+        Remove node with matching key.
+        Return True if removal was successful, False otherwise.
+        """
+        return self.unlink(key, hash) is not None
+
+    def contains(self, key: str, hash: int) -> SLNode:
+        """Return node with matching key, or None if no match."""
+        index = self._position(key, hash)
+        return self._nodes[index] if index >= 0 else None
+
+    def move_to_front(self, key: str, hash: int) -> SLNode:
+        """Return node with matching key, or None. Order is fixed by the sort, so nothing moves."""
+        return self.contains(key, hash)
+
+    def length(self) -> int:
+        """Return the number of nodes in the bucket."""
+        return len(self._nodes)
+
+
 # ---------- For use in Open Addressing (OA) HashMap  ---------- #
 
 class HashEntry:
 
-    def __init__(self, key: str, value: object) -> None:
-        """Initialize an entry for use in a hash map."""
+    __slots__ = ('key', 'value', 'hash', 'is_tombstone')
+
+    def __init__(self, key: str, value: object, hash: int = None) -> None:
+        """Initialize an entry for use in a hash map, optionally with the key's cached hash."""
         self.key = key
         self.value = value
+        self.hash = hash
 
         # Set this value to True when you "delete" a HashEntry
         self.is_tombstone = False
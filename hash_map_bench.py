@@ -0,0 +1,740 @@
+# Course: CS261 - Data Structures
+# Assignment: Portfolio Project - Assignment 6 - Hash Maps
+# Description: Benchmarks for the separate chaining (SC) and open addressing (OA) hash maps.
+# Run every benchmark with `python hash_map_bench.py`, or name the ones to run, e.g.
+# `python hash_map_bench.py oa_remove`.
+
+import gc
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import a6_include
+import hash_map_oa
+import hash_map_oa_compact
+import hash_map_oa_dense
+import hash_map_rh
+import hash_map_sc
+import hash_map_sc_array
+from a6_include import (DynamicArray, HashEntry, LinkedList, SLNode, next_prime,
+                        hash_function_1, hash_function_2, hash_function_fnv1a,
+                        hash_function_polynomial, hash_function_builtin)
+
+HASH_FUNCTIONS = (hash_function_1, hash_function_2, hash_function_fnv1a,
+                  hash_function_polynomial, hash_function_builtin)
+
+
+def _timed(func) -> float:
+    """Return the wall-clock seconds taken by func()."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _traced_bytes(build) -> tuple:
+    """Return the object build() returns and the bytes it left allocated, measured with tracemalloc."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def _traced_peak(func) -> int:
+    """Return the most bytes func() had allocated at any one time, measured with tracemalloc."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak - before
+
+
+def _key_sets(count: int) -> dict:
+    """Build a few realistic key sets of roughly count keys each."""
+    rng = random.Random(261)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    words = [''.join(rng.choice(letters) for _ in range(rng.randint(4, 12))) for _ in range(count)]
+    base = 'abcdefgh'
+    anagrams = set()
+    while len(anagrams) < min(count, 40320):
+        anagrams.add(''.join(rng.sample(base, len(base))))
+    return {
+        'sequential': ['str' + str(i) for i in range(count)],
+        'words': words,
+        'paths': ['/api/v1/users/' + str(rng.randrange(10 ** 6)) + '/orders/' + str(i) for i in range(count)],
+        'anagrams': list(anagrams),
+    }
+
+
+# ------------------- Hash functions --------------------------------------- #
+
+def bench_hash_distribution(count: int = 20000) -> None:
+    """
+    Load each key set into SC maps sized to the key count and report bucket occupancy and
+    chain lengths for every hash function, along with the raw hashing cost.
+    """
+    print("\nHash distribution -- SC map at load 1.0")
+    print(f"{'keys':>10} {'function':>25} {'used':>6} {'max chain':>10} {'usec / hash':>12}")
+    for name, keys in _key_sets(count).items():
+        for function in HASH_FUNCTIONS:
+            m = hash_map_sc.HashMap(len(keys), function)
+            for key in keys:
+                m.put(key, None)
+            longest = 0
+            for index in range(m.get_capacity()):
+                longest = max(longest, m._buckets[index].length())
+            used = 1 - m.empty_buckets() / m.get_capacity()
+
+            def hash_all():
+                for key in keys:
+                    function(key)
+
+            seconds = _timed(hash_all)
+            print(f"{name:>10} {function.__name__:>25} {used:>6.2f} {longest:>10} "
+                  f"{seconds / len(keys) * 1e6:>12.3f}")
+    print("hash_function_fnv1a is a distribution reference, hashed byte by byte in Python; "
+          "hash_function_polynomial and hash_function_builtin are the fast options")
+
+
+# ------------------- DynamicArray access ---------------------------------- #
+
+def bench_dynamic_array_scan(length: int = 10 ** 6) -> None:
+    """Compare a full scan through get_at_index() with [] indexing and with plain iteration."""
+    print(f"\nDynamicArray full scan -- {length} slots")
+    da = DynamicArray(length=length)
+
+    def by_get_at_index():
+        for index in range(da.length()):
+            da.get_at_index(index)
+
+    def by_indexing():
+        for index in range(da.length()):
+            da[index]
+
+    def by_iteration():
+        for _ in da:
+            pass
+
+    for label, scan in (('get_at_index', by_get_at_index), ('[] indexing', by_indexing),
+                        ('iteration', by_iteration)):
+        print(f"{label:>14} {_timed(scan) / length * 1e9:>8.1f} ns / slot")
+
+
+def bench_construct_and_clear(capacity: int = 10 ** 6) -> None:
+    """Time building a bucket table by appending one slot at a time against the one-step fill, plus clear()."""
+    print(f"\nBucket table construction -- capacity {capacity}")
+
+    def append_loop():
+        buckets = DynamicArray()
+        for _ in range(capacity):
+            buckets.append(None)
+
+    print(f"{'append loop':>22} {_timed(append_loop):>7.3f} s")
+    print(f"{'DynamicArray(length=)':>22} {_timed(lambda: DynamicArray(length=capacity)):>7.3f} s")
+    for label, map_class in (('sc', hash_map_sc.HashMap), ('oa', hash_map_oa.HashMap)):
+        holder = []
+        build_seconds = _timed(lambda: holder.append(map_class(capacity, hash_function_builtin)))
+        m = holder[0]
+        for i in range(1000):
+            m.put('key' + str(i), i)
+        print(f"{label + ' HashMap()':>22} {build_seconds:>7.3f} s   clear() {_timed(m.clear):>7.3f} s")
+
+
+# ------------------- Prime capacities ------------------------------------- #
+
+def _next_prime_by_trial_division(capacity: int) -> int:
+    """The original _next_prime/_is_prime pair, kept here as the baseline."""
+    if capacity % 2 == 0:
+        capacity += 1
+    while True:
+        factor = 3
+        while factor ** 2 <= capacity and capacity % factor != 0:
+            factor += 2
+        if capacity > 1 and factor ** 2 > capacity:
+            return capacity
+        capacity += 2
+
+
+def bench_next_prime() -> None:
+    """Compare trial division with the sieve table / Miller-Rabin lookup for small and growing capacities."""
+    print("\nnext_prime -- trial division vs table lookup")
+    print(f"{'capacities':>28} {'trial (ms)':>11} {'table (ms)':>11}")
+    workloads = {
+        '10^5 small maps (<= 1000)': [i % 1000 for i in range(10 ** 5)],
+        'doubling 11 -> 2^40': [11 * 2 ** i for i in range(37)],
+    }
+    for name, capacities in workloads.items():
+        timings = []
+        for function in (_next_prime_by_trial_division, next_prime):
+            timings.append(_timed(lambda: [function(capacity) for capacity in capacities]))
+        print(f"{name:>28} {timings[0] * 1e3:>11.2f} {timings[1] * 1e3:>11.2f}")
+
+
+# ------------------- SC HashMap ------------------------------------------- #
+
+def _sc_resize_by_put(m: hash_map_sc.HashMap, new_capacity: int) -> None:
+    """The original SC resize: empty the table and put() every key back in."""
+    m._capacity = m._next_prime(new_capacity)
+    old_buckets = m._buckets
+    m._buckets = DynamicArray()
+    m._size = 0
+    for _ in range(m._capacity):
+        m._buckets.append(LinkedList())
+    for index in range(old_buckets.length()):
+        for node in old_buckets[index]:
+            m.put(node.key, node.value)
+
+
+def bench_sc_resize(sizes: tuple = (10 ** 4, 10 ** 5, 10 ** 6)) -> None:
+    """Compare re-inserting with put() against relinking nodes when doubling an SC map."""
+    print("\nSC resize_table -- put() rehash vs node relink")
+    print(f"{'keys':>9} {'put (s)':>9} {'relink (s)':>11} {'speedup':>8}")
+    for size in sizes:
+        timings = []
+        for resize in (_sc_resize_by_put, hash_map_sc.HashMap.resize_table):
+            m = hash_map_sc.HashMap(size, hash_function_2)
+            for i in range(size):
+                m.put('key' + str(i), i)
+            timings.append(_timed(lambda: resize(m, m.get_capacity() * 2)))
+        print(f"{size:>9} {timings[0]:>9.2f} {timings[1]:>11.2f} {timings[0] / timings[1]:>8.2f}")
+
+
+def bench_sc_move_to_front(keys: int = 20000, reads: int = 200000, skew: float = 1.1) -> None:
+    """
+    Read keys drawn from a Zipfian distribution out of SC maps with and without the move-to-front
+    policy. hash_function_1 gives the long chains the policy is meant for.
+    """
+    print(f"\nSC move-to-front -- {keys} keys, {reads} Zipfian reads (s = {skew})")
+    print(f"{'policy':>14} {'get us':>7}")
+    rng = random.Random(261)
+    names = ['key' + str(i) for i in range(keys)]
+    rng.shuffle(names)
+    weights = [1 / (rank + 1) ** skew for rank in range(keys)]
+    sample = rng.choices(names, weights, k=reads)
+    for move_to_front in (False, True):
+        m = hash_map_sc.HashMap(keys, hash_function_1, move_to_front=move_to_front)
+        for name in names:
+            m.put(name, name)
+        seconds = _timed(lambda: [m.get(name) for name in sample])
+        print(f"{'move to front' if move_to_front else 'static':>14} {seconds / reads * 1e6:>7.2f}")
+
+
+def bench_sc_churn(operations: int = 10 ** 7, window: int = 10 ** 4) -> None:
+    """
+    Interleave put() and remove() over a sliding window of live keys, so the map stays at a constant
+    size while every operation exercises the insert and unlink paths.
+    """
+    print(f"\nSC put/remove churn -- {operations} operations, {window} live keys")
+    m = hash_map_sc.HashMap(window, hash_function_builtin)
+    names = ['key' + str(i) for i in range(window * 2)]
+
+    def churn():
+        for step in range(operations // 2):
+            m.put(names[step % len(names)], step)
+            if step >= window:
+                m.remove(names[(step - window) % len(names)])
+
+    seconds = _timed(churn)
+    print(f"size {m.get_size()}, capacity {m.get_capacity()}, {operations / seconds:,.0f} ops/s")
+
+
+def bench_sc_buckets(sizes: tuple = (10 ** 4, 10 ** 5, 10 ** 6)) -> None:
+    """
+    Compare linked-list buckets with flat list buckets: bytes per entry for the whole table, and
+    put / hit / miss cost once loaded.
+    """
+    print("\nSC buckets -- linked lists vs flat lists")
+    print(f"{'keys':>9} {'buckets':>12} {'bytes / entry':>14} {'put us':>7} {'hit us':>7} {'miss us':>8}")
+    for size in sizes:
+        names = ['key' + str(i) for i in range(size)]
+        missing = ['absent' + str(i) for i in range(size)]
+        for label, map_class in (('linked list', hash_map_sc.HashMap), ('flat list', hash_map_sc_array.HashMap)):
+            def build():
+                m = map_class(size, hash_function_builtin)
+                for name in names:
+                    m.put(name, name)
+                return m
+
+            m, used = _traced_bytes(build)
+            m = map_class(size, hash_function_builtin)
+            put_seconds = _timed(lambda: [m.put(name, name) for name in names])
+            hit_seconds = _timed(lambda: [m.get(name) for name in names])
+            miss_seconds = _timed(lambda: [m.get(name) for name in missing])
+            print(f"{size:>9} {label:>12} {used / size:>14.1f} {put_seconds / size * 1e6:>7.2f} "
+                  f"{hit_seconds / size * 1e6:>7.2f} {miss_seconds / size * 1e6:>8.2f}")
+
+
+def bench_sc_treeify(letters: str = 'abcdefgh', sizes: tuple = (100, 1000, 10000)) -> None:
+    """
+    Look up anagram keys, which all share one hash_function_1 value and therefore one bucket, in SC
+    maps with treeified buckets switched off and on.
+    """
+    print(f"\nSC treeified buckets -- anagrams of {letters!r} under hash_function_1")
+    print(f"{'keys':>8} {'chain get us':>13} {'sorted get us':>14}")
+    anagrams = [''.join(order) for order in itertools.permutations(letters)]
+    for size in sizes:
+        names = anagrams[:size]
+        row = []
+        for treeify in (False, True):
+            m = hash_map_sc.HashMap(size, hash_function_1, treeify=treeify)
+            for name in names:
+                m.put(name, name)
+            seconds = _timed(lambda: [m.get(name) for name in names])
+            row.append(seconds / size * 1e6)
+        print(f"{size:>8} {row[0]:>13.2f} {row[1]:>14.2f}")
+
+
+# ------------------- OA HashMap ------------------------------------------- #
+
+def bench_oa_remove(keys: int = 400) -> None:
+    """
+    Time removing a fixed number of keys from OA maps of growing capacity.
+    Remove follows the probe sequence, so the cost per delete should stay flat.
+    """
+    print(f"\nOA remove -- {keys} keys")
+    print(f"{'capacity':>10} {'usec / remove':>14}")
+    for capacity in (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6):
+        m = hash_map_oa.HashMap(capacity, hash_function_2)
+        names = ['key' + str(i) for i in range(keys)]
+        for name in names:
+            m.put(name, name)
+
+        def remove_all():
+            for name in names:
+                m.remove(name)
+
+        seconds = _timed(remove_all)
+        print(f"{m.get_capacity():>10} {seconds / keys * 1e6:>14.2f}")
+
+
+def bench_oa_churn(rounds: int = 5, keys: int = 20000) -> None:
+    """
+    Repeatedly load and delete disjoint key sets and report how tombstones build up between
+    compactions, along with the cost per operation.
+    """
+    print(f"\nOA put/remove churn -- {keys} keys per round")
+    print(f"{'round':>6} {'capacity':>9} {'tombstones':>11} {'occupied':>9} {'usec / op':>10}")
+    m = hash_map_oa.HashMap(keys * 4, hash_function_2)
+    for r in range(rounds):
+        names = ['r' + str(r) + 'key' + str(i) for i in range(keys)]
+
+        def churn():
+            for name in names:
+                m.put(name, r)
+            for name in names:
+                m.remove(name)
+
+        seconds = _timed(churn)
+        print(f"{r:>6} {m.get_capacity():>9} {m.get_tombstone_count():>11} "
+              f"{m.occupied_load():>9.2f} {seconds / (keys * 2) * 1e6:>10.2f}")
+
+
+def _oa_resize_by_put(m: hash_map_oa.HashMap, new_capacity: int) -> None:
+    """The original OA resize: build a second map and put() every live entry into it."""
+    new_map = hash_map_oa.HashMap(new_capacity, m._hash_function)
+    for index in range(m._capacity):
+        item = m._buckets[index]
+        if item and not item.is_tombstone:
+            new_map.put(item.key, item.value)
+    m._buckets, m._capacity = new_map._buckets, new_map._capacity
+
+
+def bench_oa_resize(sizes: tuple = (10 ** 4, 10 ** 5, 10 ** 6)) -> None:
+    """Compare the put()-driven OA rehash against moving entries into a pre-sized table."""
+    print("\nOA resize_table -- put() rehash vs entry move")
+    print(f"{'keys':>9} {'put (s)':>9} {'move (s)':>9} {'speedup':>8}")
+    for size in sizes:
+        timings = []
+        for resize in (_oa_resize_by_put, hash_map_oa.HashMap.resize_table):
+            m = hash_map_oa.HashMap(size * 2, hash_function_2)
+            for i in range(size):
+                m.put('key' + str(i), i)
+            timings.append(_timed(lambda: resize(m, m.get_capacity() * 2)))
+        print(f"{size:>9} {timings[0]:>9.2f} {timings[1]:>9.2f} {timings[0] / timings[1]:>8.2f}")
+
+
+# ------------------- Both HashMaps ---------------------------------------- #
+
+def bench_capacity_modes(size: int = 200000) -> None:
+    """
+    Grow each map from a tiny table to size keys and read every key back, comparing prime
+    capacities with modulo indexing against power-of-two capacities with mask indexing.
+    """
+    print(f"\nPrime vs power-of-two capacity -- {size} keys, growing from capacity 1")
+    print(f"{'map':>4} {'function':>22} {'mode':>13} {'capacity':>9} {'put (s)':>8} {'get (s)':>8}")
+    names = ['key' + str(i) for i in range(size)]
+    for label, map_class in (('sc', hash_map_sc.HashMap), ('oa', hash_map_oa.HashMap)):
+        for function in (hash_function_2, hash_function_builtin):
+            for power_of_two in (False, True):
+                m = map_class(1, function, power_of_two=power_of_two)
+
+                def put_all():
+                    for name in names:
+                        m.put(name, name)
+
+                def get_all():
+                    for name in names:
+                        m.get(name)
+
+                put_seconds = _timed(put_all)
+                get_seconds = _timed(get_all)
+                mode = 'power of two' if power_of_two else 'prime'
+                print(f"{label:>4} {function.__name__:>22} {mode:>13} {m.get_capacity():>9} "
+                      f"{put_seconds:>8.2f} {get_seconds:>8.2f}")
+
+
+def bench_shrink(peak: int = 10 ** 6, keep: int = 1000) -> None:
+    """
+    Load peak keys into each map, remove all but keep of them, and time a full scan with
+    get_keys_and_values() once the map has (or has not) shrunk back down.
+    """
+    print(f"\nShrink on remove -- {peak} keys loaded, {keep} kept")
+    print(f"{'map':>4} {'shrink':>7} {'capacity':>9} {'remove (s)':>11} {'scan ms':>8}")
+    names = ['key' + str(i) for i in range(peak)]
+    for label, map_class in (('sc', hash_map_sc.HashMap), ('oa', hash_map_oa.HashMap)):
+        for shrink in (False, True):
+            m = map_class(11, hash_function_builtin, shrink=shrink)
+            for name in names:
+                m.put(name, name)
+            remove_seconds = _timed(lambda: [m.remove(name) for name in names[keep:]])
+            scan_seconds = _timed(m.get_keys_and_values)
+            print(f"{label:>4} {str(shrink):>7} {m.get_capacity():>9} {remove_seconds:>11.2f} "
+                  f"{scan_seconds * 1e3:>8.2f}")
+
+
+def bench_put_latency(size: int = 500000) -> None:
+    """
+    Time every put() while each map grows from a tiny table to size keys, and report the median,
+    99th percentile and worst single call with resizes done all at once or incrementally. The garbage
+    collector is paused while timing, since its full collections would otherwise set the worst case.
+    """
+    print(f"\nput() latency -- {size} keys, growing from capacity 11")
+    print(f"{'map':>4} {'resize':>12} {'p50 us':>7} {'p99 us':>7} {'max ms':>8} {'total (s)':>10}")
+    names = ['key' + str(i) for i in range(size)]
+    clock = time.perf_counter_ns
+    for label, map_class in (('sc', hash_map_sc.HashMap), ('oa', hash_map_oa.HashMap)):
+        for incremental in (False, True):
+            m = map_class(11, hash_function_builtin, incremental=incremental)
+            latencies = []
+            gc.disable()
+            for name in names:
+                start = clock()
+                m.put(name, name)
+                latencies.append(clock() - start)
+            gc.enable()
+            latencies.sort()
+            mode = 'incremental' if incremental else 'all at once'
+            print(f"{label:>4} {mode:>12} {latencies[size // 2] / 1e3:>7.2f} "
+                  f"{latencies[size * 99 // 100] / 1e3:>7.2f} {latencies[-1] / 1e6:>8.2f} "
+                  f"{sum(latencies) / 1e9:>10.2f}")
+
+
+def bench_bulk(size: int = 500000) -> None:
+    """
+    Load, read back and remove size keys one call at a time and through put_many(), get_many()
+    and remove_many(), starting each map from a tiny table.
+    """
+    print(f"\nSingle vs bulk operations -- {size} keys, growing from capacity 11")
+    print(f"{'map':>4} {'calls':>7} {'put (s)':>8} {'get (s)':>8} {'remove (s)':>11}")
+    names = ['key' + str(i) for i in range(size)]
+    pairs = [(name, name) for name in names]
+    for label, map_class in (('sc', hash_map_sc.HashMap), ('oa', hash_map_oa.HashMap)):
+        m = map_class(11, hash_function_builtin)
+        put_seconds = _timed(lambda: [m.put(key, value) for key, value in pairs])
+        get_seconds = _timed(lambda: [m.get(name) for name in names])
+        remove_seconds = _timed(lambda: [m.remove(name) for name in names])
+        print(f"{label:>4} {'single':>7} {put_seconds:>8.2f} {get_seconds:>8.2f} {remove_seconds:>11.2f}")
+
+        m = map_class(11, hash_function_builtin)
+        put_seconds = _timed(lambda: m.put_many(pairs))
+        get_seconds = _timed(lambda: m.get_many(names))
+        remove_seconds = _timed(lambda: m.remove_many(names))
+        print(f"{label:>4} {'bulk':>7} {put_seconds:>8.2f} {get_seconds:>8.2f} {remove_seconds:>11.2f}")
+
+
+def bench_iteration(size: int = 10 ** 6) -> None:
+    """
+    Walk every key-value pair of each map, once through the DynamicArray get_keys_and_values()
+    builds and once through the lazy items() iterator, and compare time and peak extra memory.
+    """
+    print(f"\nExporting key-value pairs -- {size} keys")
+    print(f"{'map':>4} {'walk':>20} {'seconds':>8} {'peak MB':>8}")
+    names = ['key' + str(i) for i in range(size)]
+    for label, map_class in (('sc', hash_map_sc.HashMap), ('oa', hash_map_oa.HashMap)):
+        m = map_class(size, hash_function_builtin)
+        m.put_many((name, name) for name in names)
+
+        def walk_array():
+            for key, value in m.get_keys_and_values():
+                pass
+
+        def walk_items():
+            for key, value in m.items():
+                pass
+
+        for walk_label, walk in (('get_keys_and_values', walk_array), ('items', walk_items)):
+            seconds = _timed(walk)
+            peak = _traced_peak(walk)
+            print(f"{label:>4} {walk_label:>20} {seconds:>8.2f} {peak / 2 ** 20:>8.1f}")
+
+
+# ------------------- Robin Hood HashMap ----------------------------------- #
+
+def bench_robin_hood(capacity: int = 200003) -> None:
+    """
+    Fill a quadratic probing map (max load 0.5) and Robin Hood maps of the same capacity, at the
+    default max load of 0.75 and at 0.9, as far as each allows, then compare hit / miss lookup cost.
+    """
+    print(f"\nQuadratic probing vs Robin Hood -- capacity {capacity}")
+    print(f"{'map':>15} {'keys':>7} {'load':>5} {'put us':>7} {'hit us':>7} {'miss us':>8}")
+    for label, m, load in (('quadratic', hash_map_oa.HashMap(capacity, hash_function_builtin), 0.49),
+                           ('robin hood', hash_map_rh.HashMap(capacity, hash_function_builtin), 0.74),
+                           ('robin hood 0.9',
+                            hash_map_rh.HashMap(capacity, hash_function_builtin, max_load=0.9), 0.89)):
+        size = int(capacity * load)
+        names = ['key' + str(i) for i in range(size)]
+        missing = ['absent' + str(i) for i in range(size)]
+        put_seconds = _timed(lambda: [m.put(name, name) for name in names])
+        hit_seconds = _timed(lambda: [m.get(name) for name in names])
+        miss_seconds = _timed(lambda: [m.get(name) for name in missing])
+        print(f"{label:>15} {size:>7} {m.table_load():>5.2f} {put_seconds / size * 1e6:>7.2f} "
+              f"{hit_seconds / size * 1e6:>7.2f} {miss_seconds / size * 1e6:>8.2f}")
+
+
+# ------------------- Compact OA HashMap ----------------------------------- #
+
+def bench_oa_memory(sizes: tuple = (10 ** 4, 10 ** 5, 10 ** 6)) -> None:
+    """
+    Compare bytes per entry and put / get cost of the object-per-slot OA map against the flat
+    parallel-array layout. Keys and values are created up front so only the map itself is measured.
+    """
+    print("\nOA memory -- object per slot vs parallel arrays")
+    print(f"{'keys':>9} {'layout':>8} {'capacity':>9} {'bytes / entry':>14} {'put us':>7} {'get us':>7}")
+    for size in sizes:
+        names = ['key' + str(i) for i in range(size)]
+        for label, map_class in (('objects', hash_map_oa.HashMap), ('arrays', hash_map_oa_compact.HashMap)):
+            def build():
+                m = map_class(size * 2 + 1, hash_function_builtin)
+                for name in names:
+                    m.put(name, name)
+                return m
+
+            start = time.perf_counter()
+            m, used = _traced_bytes(build)
+            put_seconds = time.perf_counter() - start
+            get_seconds = _timed(lambda: [m.get(name) for name in names])
+            print(f"{size:>9} {label:>8} {m.get_capacity():>9} {used / size:>14.1f} "
+                  f"{put_seconds / size * 1e6:>7.2f} {get_seconds / size * 1e6:>7.2f}")
+
+
+# ------------------- Dense OA HashMap ------------------------------------- #
+
+def bench_oa_dense(size: int = 200000) -> None:
+    """
+    Compare the object-per-slot OA map with the dense insertion-ordered layout: bytes per entry once
+    loaded, and the cost of a full scan and a resize once nine in ten keys have been removed.
+    """
+    print(f"\nOA dense layout -- {size} keys, then all but a tenth removed")
+    print(f"{'layout':>8} {'bytes / entry':>14} {'scan ms':>8} {'resize ms':>10}")
+    names = ['key' + str(i) for i in range(size)]
+    for label, map_class, options in (('objects', hash_map_oa.HashMap, {'shrink': False}),
+                                      ('dense', hash_map_oa_dense.HashMap, {})):
+        def build():
+            m = map_class(11, hash_function_builtin, **options)
+            for name in names:
+                m.put(name, name)
+            return m
+
+        m, used = _traced_bytes(build)
+        for name in names[size // 10:]:
+            m.remove(name)
+        scan_seconds = _timed(lambda: [item for item in m.items()])
+        resize_seconds = _timed(lambda: m.resize_table(m.get_capacity()))
+        print(f"{label:>8} {used / size:>14.1f} {scan_seconds * 1e3:>8.2f} {resize_seconds * 1e3:>10.2f}")
+
+
+# ------------------- find_mode -------------------------------------------- #
+
+def _find_mode_three_calls(da: DynamicArray) -> tuple:
+    """find_mode() as it used to count: contains_key(), get() and put() per element, two passes after."""
+    frequency = hash_map_sc.HashMap()
+    for key in da:
+        if frequency.contains_key(key):
+            frequency.put(key, frequency.get(key) + 1)
+        else:
+            frequency.put(key, 1)
+    keys_and_values = frequency.get_keys_and_values()
+    highest_frequency = max((value for key, value in keys_and_values), default=0)
+    mode = DynamicArray([key for key, value in keys_and_values if value == highest_frequency])
+    return mode, highest_frequency
+
+
+def bench_find_mode(sizes: tuple = (10 ** 4, 10 ** 5, 10 ** 6), categories: int = 1000) -> None:
+    """
+    Find the mode of log-like category strings drawn from a Zipfian distribution, counting with
+    three calls per element, with the single-walk counting path, and with the NumPy path.
+    """
+    print(f"\nfind_mode -- {categories} Zipfian categories")
+    print(f"{'elements':>9} {'three calls (s)':>16} {'counting (s)':>13} {'numpy (s)':>10}")
+    rng = random.Random(261)
+    names = ['category' + str(i) for i in range(categories)]
+    weights = [1 / (rank + 1) for rank in range(categories)]
+    for size in sizes:
+        da = DynamicArray(rng.choices(names, weights, k=size))
+        old_seconds = _timed(lambda: _find_mode_three_calls(da))
+        new_seconds = _timed(lambda: hash_map_sc.find_mode(da))
+        if hash_map_sc.numpy is None:
+            numpy_column = 'n/a'
+        else:
+            numpy_column = f"{_timed(lambda: hash_map_sc.find_mode(da, vectorized=True)):.2f}"
+        print(f"{size:>9} {old_seconds:>16.2f} {new_seconds:>13.2f} {numpy_column:>10}")
+
+
+def bench_find_mode_stream(lines: int = 10 ** 6, categories: int = 1000) -> None:
+    """
+    Find the mode of a file of newline-delimited Zipfian categories, once by reading every line into a
+    DynamicArray first and once by streaming the file, and compare time and peak memory.
+    """
+    print(f"\nfind_mode over a file -- {lines} lines, {categories} Zipfian categories")
+    print(f"{'read':>12} {'seconds':>8} {'peak MB':>8} {'frequency':>10}")
+    rng = random.Random(261)
+    names = ['category' + str(i) for i in range(categories)]
+    weights = [1 / (rank + 1) for rank in range(categories)]
+    descriptor, path = tempfile.mkstemp(suffix='.txt')
+    with os.fdopen(descriptor, 'w') as file:
+        file.writelines(name + '\n' for name in rng.choices(names, weights, k=lines))
+
+    def whole_file():
+        with open(path) as file:
+            return hash_map_sc.find_mode(DynamicArray([line.strip() for line in file]))
+
+    def streamed():
+        for result in hash_map_sc.find_mode_file(path):
+            pass
+        return result
+
+    try:
+        for label, read in (('whole file', whole_file), ('streamed', streamed)):
+            start = time.perf_counter()
+            mode, frequency = read()
+            seconds = time.perf_counter() - start
+            peak = _traced_peak(read)
+            print(f"{label:>12} {seconds:>8.2f} {peak / 2 ** 20:>8.1f} {frequency:>10}")
+    finally:
+        os.remove(path)
+
+
+def bench_find_mode_parallel(size: int = 2 * 10 ** 6, categories: int = 1000,
+                             workers: tuple = (1, 2, 4, 8)) -> None:
+    """
+    Find the mode with find_mode_parallel at several worker counts and report the speedup over the
+    serial find_mode and over one worker process, which pays the same partitioning and pickling costs.
+    Zipfian categories keep the distinct keys few; the second input makes half the elements distinct,
+    so the workers send back many candidate modes. The speedup is bounded by the CPUs available.
+    """
+    rng = random.Random(261)
+    names = ['category' + str(i) for i in range(categories)]
+    weights = [1 / (rank + 1) for rank in range(categories)]
+    inputs = ((f"{categories} Zipfian categories", rng.choices(names, weights, k=size)),
+              (f"{size // 2} uniform keys", ['key' + str(rng.randrange(size // 2)) for _ in range(size)]))
+
+    for label, values in inputs:
+        print(f"\nfind_mode_parallel -- {size} elements, {label}, {os.cpu_count()} CPUs")
+        print(f"{'workers':>8} {'seconds':>8} {'vs serial':>10} {'vs 1 worker':>12} {'frequency':>10}")
+        da = DynamicArray(values)
+
+        result = []
+        serial = _timed(lambda: result.append(hash_map_sc.find_mode(da)))
+        print(f"{'serial':>8} {serial:>8.2f} {1.0:>10.2f} {'':>12} {result[-1][1]:>10}")
+        one_worker = _timed(lambda: result.append(hash_map_sc.find_mode_parallel(da, 1)))
+        for count in workers:
+            seconds = one_worker if count == 1 else _timed(
+                lambda: result.append(hash_map_sc.find_mode_parallel(da, count)))
+            print(f"{count:>8} {seconds:>8.2f} {serial / seconds:>10.2f} {one_worker / seconds:>12.2f} "
+                  f"{result[-1][1]:>10}")
+
+
+# ------------------- Slotted nodes and containers ------------------------- #
+
+def _without_slots(cls: type) -> type:
+    """Rebuild a slotted class as an ordinary one with a per-instance __dict__, methods unchanged."""
+    namespace = {name: member for name, member in vars(cls).items()
+                 if name not in cls.__slots__ and name not in ('__slots__', '__dict__', '__weakref__')}
+    return type(cls.__name__, (), namespace)
+
+
+def bench_slots(size: int = 10 ** 6) -> None:
+    """
+    Measure bytes per entry and put / get throughput for both maps with the slotted a6_include
+    classes, and again with __dict__-based copies of the same classes swapped in.
+    """
+    print(f"\n__slots__ vs __dict__ -- {size} string keys")
+    print(f"{'map':>4} {'classes':>8} {'bytes / entry':>14} {'put ops/s':>10} {'get ops/s':>10}")
+    names = ['key' + str(i) for i in range(size)]
+    plain = {cls: _without_slots(cls) for cls in (DynamicArray, LinkedList, SLNode, HashEntry)}
+    patches = (
+        (hash_map_sc, 'DynamicArray', DynamicArray), (hash_map_sc, 'LinkedList', LinkedList),
+        (a6_include, 'SLNode', SLNode), (hash_map_oa, 'DynamicArray', DynamicArray),
+        (hash_map_oa, 'HashEntry', HashEntry),
+    )
+    for label, map_class in (('sc', hash_map_sc.HashMap), ('oa', hash_map_oa.HashMap)):
+        for slotted in (False, True):
+            if not slotted:
+                for module, name, cls in patches:
+                    setattr(module, name, plain[cls])
+            try:
+                def build():
+                    m = map_class(size * 2, hash_function_builtin)
+                    for name in names:
+                        m.put(name, name)
+                    return m
+
+                m, used = _traced_bytes(build)
+                m = map_class(size * 2, hash_function_builtin)
+                put_seconds = _timed(lambda: [m.put(name, name) for name in names])
+                get_seconds = _timed(lambda: [m.get(name) for name in names])
+            finally:
+                for module, name, cls in patches:
+                    setattr(module, name, cls)
+            print(f"{label:>4} {'slots' if slotted else 'dict':>8} {used / size:>14.1f} "
+                  f"{size / put_seconds:>10.0f} {size / get_seconds:>10.0f}")
+
+
+BENCHMARKS = {
+    'dynamic_array_scan': bench_dynamic_array_scan,
+    'construct_and_clear': bench_construct_and_clear,
+    'next_prime': bench_next_prime,
+    'hash_distribution': bench_hash_distribution,
+    'sc_resize': bench_sc_resize,
+    'sc_move_to_front': bench_sc_move_to_front,
+    'sc_churn': bench_sc_churn,
+    'sc_buckets': bench_sc_buckets,
+    'sc_treeify': bench_sc_treeify,
+    'oa_remove': bench_oa_remove,
+    'oa_churn': bench_oa_churn,
+    'oa_resize': bench_oa_resize,
+    'capacity_modes': bench_capacity_modes,
+    'shrink': bench_shrink,
+    'put_latency': bench_put_latency,
+    'bulk': bench_bulk,
+    'iteration': bench_iteration,
+    'robin_hood': bench_robin_hood,
+    'oa_memory': bench_oa_memory,
+    'oa_dense': bench_oa_dense,
+    'slots': bench_slots,
+    'find_mode': bench_find_mode,
+    'find_mode_stream': bench_find_mode_stream,
+    'find_mode_parallel': bench_find_mode_parallel,
+}
+
+
+if __name__ == "__main__":
+    selected = sys.argv[1:] or list(BENCHMARKS)
+    for name in selected:
+        BENCHMARKS[name]()
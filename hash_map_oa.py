@@ -5,34 +5,67 @@
 # Due Date: December 10th, 2023
 # Description: Implementing the following methods through open addressing hash maps: put(), empty_buckets(),
 # table_load(), clear(), resize_table(), get(), contains_key(), remove(), get_keys_and_values()
-# __iter__(), __next__() [iterator implementation]
+# __iter__() [iterator implementation], keys(), values(), items()
 
-from a6_include import (DynamicArray, DynamicArrayException, HashEntry,
-                        hash_function_1, hash_function_2)
+from a6_include import (DynamicArray, HashEntry,
+                        hash_function_1, hash_function_2, is_prime, mix_hash, next_prime)
+
+# a remove that takes the load factor below this halves the table; growing happens at 0.5, so a
+# halved table sits well clear of both thresholds
+SHRINK_LOAD = 0.125
+
+# buckets of the old table moved over by each put(), get() or remove() during an incremental resize
+REHASH_STEP = 8
 
 
 class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+    def __init__(self, capacity: int, function, power_of_two: bool = False, shrink: bool = True,
+                 incremental: bool = False) -> None:
         """
         Initialize new HashMap that uses
         quadratic probing for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+
+        With power_of_two set, capacities are powers of two, buckets are picked by masking the
+        mixed hash and probing steps by triangular numbers, which visit every bucket.
+
+        With shrink set, a remove that takes the load factor below SHRINK_LOAD halves the table,
+        but never below the capacity last asked for through the constructor or resize_table().
+
+        With incremental set, a resize only allocates the new table. Each later put(), get() and
+        remove() moves REHASH_STEP buckets of the old table over, and lookups probe both tables
+        until the move is done, so no single call pays for rehashing the whole map.
         """
-        self._buckets = DynamicArray()
+        self._power_of_two = power_of_two
+        self._shrink = shrink
+
+        # what each probe step grows by: steps of 1, 3, 5, ... from the first bucket visit the buckets
+        # j ** 2 past it, and steps of 1, 2, 3, ... the triangular numbers past it, which every power
+        # of two capacity needs to reach all of its buckets
+        self._stride = 1 if power_of_two else 2
+        self._incremental = incremental
+
+        # old table of an incremental resize and the next of its buckets to move
+        self._old_buckets = None
+        self._rehash_index = 0
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
-        for _ in range(self._capacity):
-            self._buckets.append(None)
+        # capacity must be a prime number (or a power of two)
+        self._capacity = self._next_capacity(capacity)
+        self._min_capacity = self._capacity
+        self._buckets = DynamicArray(length=self._capacity)
 
         self._hash_function = function
         self._size = 0
+        self._tombstones = 0
+
+        # bumped whenever a key is added or removed or the table is rebuilt, so iterators can tell
+        self._version = 0
 
     def __str__(self) -> str:
         """
-        Override string method to provide more readable output
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Override string method to provide more readable output. An incremental resize still in
+        progress is completed first, so that every key is in the table shown.
         """
+        self._finish_rehash()
         out = ''
         for i in range(self._buckets.length()):
             out += str(i) + ': ' + str(self._buckets[i]) + '\n'
@@ -41,35 +74,30 @@ class HashMap:
     def _next_prime(self, capacity: int) -> int:
         """
         Increment from given number to find the closest prime number
-        DO NOT CHANGE THIS METHOD IN ANY WAY
         """
-        if capacity % 2 == 0:
-            capacity += 1
-
-        while not self._is_prime(capacity):
-            capacity += 2
-
-        return capacity
+        return next_prime(capacity)
 
     @staticmethod
     def _is_prime(capacity: int) -> bool:
         """
         Determine if given integer is a prime number and return boolean
-        DO NOT CHANGE THIS METHOD IN ANY WAY
         """
-        if capacity == 2 or capacity == 3:
-            return True
-
-        if capacity == 1 or capacity % 2 == 0:
-            return False
+        return is_prime(capacity)
 
-        factor = 3
-        while factor ** 2 <= capacity:
-            if capacity % factor == 0:
-                return False
-            factor += 2
+    @staticmethod
+    def _next_power_of_two(capacity: int) -> int:
+        """
+        Round the given integer up to the closest power of two
+        """
+        return 1 << max(capacity - 1, 0).bit_length()
 
-        return True
+    def _next_capacity(self, capacity: int) -> int:
+        """
+        Round the given integer up to the closest valid capacity for this map's mode
+        """
+        if self._power_of_two:
+            return self._next_power_of_two(capacity)
+        return self._next_prime(capacity)
 
     def get_size(self) -> int:
         """
@@ -93,64 +121,186 @@ class HashMap:
         value replaced with the new one. Otherwise, the key-value pair is added into the hash map.
 
         Table resizes are doubled from its capacity and the load factor is greater than or equal to 0.5.
+        When live entries and tombstones together fill 0.75 of the table, it is rehashed in place at
+        the same capacity to clear the tombstones out of the probe chains.
         """
-        new_entry = HashEntry(key, value)
+        # move an incremental resize along
+        if self._old_buckets is not None:
+            self._migrate(REHASH_STEP)
 
         # resize if load factor greater than or equal to 0.5
         load_factor = self.table_load()
 
         if load_factor >= 0.5:
             double_capacity = self._capacity * 2
-            self.resize_table(double_capacity)
+            self._rehash(double_capacity)
+
+        # compact if tombstones are crowding the table
+        elif self.occupied_load() >= 0.75:
+            self._rehash(self._capacity)
 
-        # get the hash value and its index
         hash_value = self._hash_function(key)
-        initial_index = hash_value % self.get_capacity()
-        index = initial_index
+        if self._power_of_two:
+            hash_value = mix_hash(hash_value)
+
+        # mid-resize, the key may still be in the part of the old table that has not been moved yet
+        if self._old_buckets is not None:
+            entry = self._find_old_entry(key, hash_value)
+            if entry is not None:
+                entry.value = value
+                return
+
+        self._insert(key, value, hash_value)
+
+    def _insert(self, key: str, value: object, hash_value: int) -> None:
+        """
+        Update the key's value in the current table, or add the key-value pair to it
+        """
+        buckets, capacity = self._buckets, self._capacity
+        stride, masked, mask = self._stride, self._power_of_two, capacity - 1
+
+        # get the index of the hash value
+        index = hash_value & mask if masked else hash_value % capacity
+        step = 1
+        tombstone_index = None
 
         j = 0
-        while j < self._capacity:
+        while j < capacity:
+            entry = buckets[index]
 
-            # insert key-value pairs at this index
-            if self._buckets[index] is None or self._buckets[index].is_tombstone:
-                self._buckets[index] = new_entry
-                self._size += 1
-                return
+            # end of the probe sequence -- the key is not in the map
+            if entry is None:
+                break
+
+            # remember the first tombstone, but keep probing in case the key lives further along
+            if entry.is_tombstone:
+                if tombstone_index is None:
+                    tombstone_index = index
 
             # replace existing value with new value
-            elif self._buckets[index].key == key:
-                self._buckets[index].value = value
+            elif entry.hash == hash_value and entry.key == key:
+                entry.value = value
                 return
 
             # traverse to the next index using quadratic probing
             j += 1
-            index = (initial_index + j ** 2) % self._capacity
+            index = (index + step) & mask if masked else (index + step) % capacity
+            step += stride
+
+        # insert key-value pair, reusing a tombstone when one was passed
+        if tombstone_index is not None:
+            index = tombstone_index
+            self._tombstones -= 1
+        buckets[index] = HashEntry(key, value, hash_value)
+        self._size += 1
+        self._version += 1
 
     def resize_table(self, new_capacity: int) -> None:
         """
         Method that changes the capacity of the hash table and rehashes existing key-value pairs into
-        the new hash map.
+        the new hash map. The resulting capacity is also the floor that automatic shrinking stops at.
         """
         if new_capacity < self._size:
             return
+        self._rehash(new_capacity)
+        self._min_capacity = self._capacity
 
-        # check prime and get the next prime if not
-        if not self._is_prime(new_capacity):
-            new_capacity = self._next_prime(new_capacity)
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        Move the live entries into a new table of at least the given capacity, dropping tombstones,
+        or in incremental mode set the new table up and leave the entries to be moved by later calls
+        """
+        # a resize still in progress is completed before the next one starts
+        self._finish_rehash()
+        self._version += 1
+
+        # get the next prime (or power of two), as the constructor would (2 becomes 3)
+        new_capacity = self._next_capacity(new_capacity)
+
+        # grow the same way re-inserting every entry with put() would have
+        while self._size > 0 and (self._size - 1) * 2 >= new_capacity:
+            new_capacity = self._next_capacity(new_capacity * 2)
 
-        # create new hash map to rehash innards
-        new_hash_map = HashMap(new_capacity, self._hash_function)
+        old_buckets = self._buckets
+        self._buckets = DynamicArray(length=new_capacity)
+        self._capacity = new_capacity
+        self._tombstones = 0
+
+        if self._incremental:
+            self._old_buckets = old_buckets
+            self._rehash_index = 0
+            return
+
+        # move the live entries into the new table -- keys are unique, so each one only needs
+        # the first empty bucket along its probe sequence
+        buckets = self._buckets
+        stride, masked, mask = self._stride, self._power_of_two, new_capacity - 1
+        for item in old_buckets:
+            if item and not item.is_tombstone:
+                index = item.hash & mask if masked else item.hash % new_capacity
+                step = 1
+                while buckets[index] is not None:
+                    index = (index + step) & mask if masked else (index + step) % new_capacity
+                    step += stride
+                buckets[index] = item
 
-        # rehash key-value pairs
-        for num in range(self._capacity):
-            item = self._buckets[num]
+    def _migrate(self, count: int) -> None:
+        """
+        Move the live entries in the next count buckets of the old table into the new one, and drop
+        the old table once every bucket has been moved
+        """
+        old_buckets = self._old_buckets
+        stop = min(self._rehash_index + count, old_buckets.length())
+        buckets, capacity = self._buckets, self._capacity
+        stride, masked, mask = self._stride, self._power_of_two, capacity - 1
 
+        for old_index in range(self._rehash_index, stop):
+            item = old_buckets[old_index]
             if item and not item.is_tombstone:
-                new_hash_map.put(item.key, item.value)
+                # the key is not in the new table, so the first free bucket, or tombstone, will do
+                index = item.hash & mask if masked else item.hash % capacity
+                step = 1
+                while buckets[index] is not None and not buckets[index].is_tombstone:
+                    index = (index + step) & mask if masked else (index + step) % capacity
+                    step += stride
+                if buckets[index] is not None:
+                    self._tombstones -= 1
+                buckets[index] = item
+        self._rehash_index = stop
+
+        if stop == old_buckets.length():
+            self._old_buckets = None
+
+    def _finish_rehash(self) -> None:
+        """
+        Complete an incremental resize that is still in progress
+        """
+        if self._old_buckets is not None:
+            self._migrate(self._old_buckets.length())
 
-        # update new values of new hash map
-        self._buckets, self._capacity = new_hash_map._buckets, new_hash_map._capacity
-        self._size = new_hash_map._size
+    def _find_old_entry(self, key: str, hash_value: int):
+        """
+        Follow the probe sequence of the old table during an incremental resize and return the live
+        entry for the given key, or None. Buckets that have already been moved count as tombstones.
+        """
+        old_buckets = self._old_buckets
+        capacity = old_buckets.length()
+        stride, masked, mask = self._stride, self._power_of_two, capacity - 1
+        index = hash_value & mask if masked else hash_value % capacity
+        step = 1
+
+        j = 0
+        while j < capacity:
+            entry = old_buckets[index]
+            if entry is None:
+                return None
+            if (index >= self._rehash_index and entry.hash == hash_value and entry.key == key
+                    and not entry.is_tombstone):
+                return entry
+            j += 1
+            index = (index + step) & mask if masked else (index + step) % capacity
+            step += stride
+        return None
 
     def table_load(self) -> float:
         """
@@ -158,28 +308,46 @@ class HashMap:
         """
         return self._size / self._capacity
 
+    def occupied_load(self) -> float:
+        """
+        Return the fraction of buckets holding either a live entry or a tombstone. This is what
+        probe lengths degrade with, even while table_load() stays low.
+        """
+        return (self._size + self._tombstones) / self._capacity
+
+    def get_tombstone_count(self) -> int:
+        """
+        Return the number of tombstones currently left in the hash table.
+        """
+        return self._tombstones
+
     def empty_buckets(self) -> int:
         """
-        Determine the number of empty buckets in the HashMap.
+        Determine the number of empty buckets in the HashMap. Tombstones are not empty.
         """
-        return self._capacity - self._size
+        self._finish_rehash()
+        return self._capacity - self._size - self._tombstones
 
     def get(self, key: str) -> object:
         """
         Return the value associated with the given key. Return None if the key is not in the hash map.
         """
-        hash_key = self._hash_function(key) % self._capacity
-        hash_value = self._buckets[hash_key]
-        i_value = 1
-        while hash_value is not None:
-            if hash_value.key == key and hash_value.is_tombstone is not True:
-                return hash_value.value
-            elif hash_value.key == key and hash_value.is_tombstone is True:
-                return None
-            else:
-                hash_key = (self._hash_function(key) + i_value ** 2) % self.get_capacity()
-                hash_value = self._buckets[hash_key]
-                i_value += 1
+        # move an incremental resize along
+        if self._old_buckets is not None:
+            self._migrate(REHASH_STEP)
+
+        hash_value = self._hash_function(key)
+        if self._power_of_two:
+            hash_value = mix_hash(hash_value)
+        index = self._find_index(key, hash_value)
+        if index is not None:
+            return self._buckets[index].value
+
+        # mid-resize, fall back to the part of the old table that has not been moved yet
+        if self._old_buckets is not None:
+            entry = self._find_old_entry(key, hash_value)
+            if entry is not None:
+                return entry.value
         return None
 
     def contains_key(self, key: str) -> bool:
@@ -196,26 +364,169 @@ class HashMap:
         Remove the given key and its associated value from the hash map. Do nothing if the key is not in the
         hash map.
         """
-        for index in range(self._buckets.length()):
-            if self._buckets[index] is not None and self._buckets[index].key == key and \
-                    self._buckets[index].is_tombstone is not True:
-                self._buckets[index].is_tombstone = True
+        # move an incremental resize along
+        if self._old_buckets is not None:
+            self._migrate(REHASH_STEP)
+
+        hash_value = self._hash_function(key)
+        if self._power_of_two:
+            hash_value = mix_hash(hash_value)
+        index = self._find_index(key, hash_value)
+        if index is not None:
+            self._buckets[index].is_tombstone = True
+            self._tombstones += 1
+
+        # mid-resize, an entry still in the old table is marked there and skipped when it is moved
+        else:
+            entry = None if self._old_buckets is None else self._find_old_entry(key, hash_value)
+            if entry is None:
+                return
+            entry.is_tombstone = True
+
+        self._size -= 1
+        self._version += 1
+        self._shrink_if_sparse()
+
+    def _shrink_if_sparse(self) -> None:
+        """
+        Give memory back once most of the keys are gone: halve the table while the load factor is below
+        SHRINK_LOAD, but not below the shrink floor, and rehash once to the result
+        """
+        if not self._shrink:
+            return
+        capacity = self._capacity
+        while self._size < capacity * SHRINK_LOAD and capacity > self._min_capacity:
+            capacity = max(capacity // 2, self._min_capacity)
+        if capacity != self._capacity:
+            self._rehash(capacity)
+
+    def shrink_to_fit(self) -> None:
+        """
+        Resize the hash table down to the smallest capacity that holds the current entries at a load
+        factor below 0.5, dropping any tombstones.
+        """
+        self.resize_table(self._size * 2 + 1)
+
+    # ------------------------------------------------------------------ #
+
+    def _reserve(self, count: int) -> None:
+        """
+        Make room for count more keys with at most one resize, so that adding them neither grows nor
+        compacts the table again, and complete any incremental resize so every key is in the current table.
+        The table at least doubles, as it would in put(), so a run of small batches does not rehash every time.
+        """
+        if (self._size + count - 1) * 2 >= self._capacity:
+            self._rehash(max((self._size + count) * 2, self._capacity * 2))
+        elif self._size + self._tombstones + count - 1 >= self._capacity * 0.75:
+            self._rehash(self._capacity)
+        self._finish_rehash()
+
+    def _hash_many(self, keys) -> list:
+        """
+        Return a list of the hashes of the given keys, mixed when the capacity is a power of two
+        """
+        hash_function = self._hash_function
+        hashes = [hash_function(key) for key in keys]
+        if self._power_of_two:
+            hashes = [mix_hash(hash_value) for hash_value in hashes]
+        return hashes
+
+    def put_many(self, pairs) -> None:
+        """
+        Put every (key, value) pair of the given iterable into the hash map, as put() would one at a
+        time. The table is resized at most once, up front, for the number of pairs.
+        """
+        if not hasattr(pairs, '__len__'):
+            pairs = list(pairs)
+        if not pairs:
+            return
+        self._reserve(len(pairs))
+
+        hashes = self._hash_many(key for key, _ in pairs)
+        for (key, value), hash_value in zip(pairs, hashes):
+            self._insert(key, value, hash_value)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Return a DynamicArray of the values of the given keys, in order, with None for each key that
+        is not in the hash map.
+        """
+        # mid-resize, the keys may be in either table
+        if self._old_buckets is not None:
+            return DynamicArray([self.get(key) for key in keys])
+
+        if not hasattr(keys, '__len__'):
+            keys = list(keys)
+
+        buckets = self._buckets
+        values = []
+        for key, hash_value in zip(keys, self._hash_many(keys)):
+            index = self._find_index(key, hash_value)
+            values.append(None if index is None else buckets[index].value)
+        return DynamicArray(values)
+
+    def remove_many(self, keys) -> DynamicArray:
+        """
+        Remove each of the given keys from the hash map and return a DynamicArray of their values, in
+        order, with None for each key that was not in the hash map. The table shrinks at most once,
+        after all of the keys are removed.
+        """
+        self._finish_rehash()
+        if not hasattr(keys, '__len__'):
+            keys = list(keys)
+
+        buckets = self._buckets
+        values = []
+        for key, hash_value in zip(keys, self._hash_many(keys)):
+            index = self._find_index(key, hash_value)
+            if index is None:
+                values.append(None)
+            else:
+                buckets[index].is_tombstone = True
+                values.append(buckets[index].value)
                 self._size -= 1
+                self._version += 1
+                self._tombstones += 1
+
+        self._shrink_if_sparse()
+        return DynamicArray(values)
+
+    def _find_index(self, key: str, hash_value: int):
+        """
+        Follow the quadratic probe sequence for the given key and its hash and return the index of its
+        live entry, or None once an empty bucket ends the sequence.
+        """
+        buckets, capacity = self._buckets, self._capacity
+        stride, masked, mask = self._stride, self._power_of_two, capacity - 1
+        index = hash_value & mask if masked else hash_value % capacity
+        step = 1
+
+        j = 0
+        while j < capacity:
+            entry = buckets[index]
+            if entry is None:
+                return None
+            if entry.hash == hash_value and entry.key == key and not entry.is_tombstone:
+                return index
+            j += 1
+            index = (index + step) & mask if masked else (index + step) % capacity
+            step += stride
+        return None
 
     def get_keys_and_values(self) -> DynamicArray:
         """
         Method that returns a dynamic array of indexes of tuple key-value pairs within the hash map
         in any key order.
         """
+        self._finish_rehash()
         keys_and_values = DynamicArray()
-        hash_map = self
 
         # traverse through array
-        for index in hash_map:
+        for entry in self._buckets:
 
             # append any key-value pairs that are not tombstones into hash map
-            if index is not None and index.is_tombstone is False:
-                keys_and_values.append((index.key, index.value))
+            if entry is not None and entry.is_tombstone is False:
+                keys_and_values.append((entry.key, entry.value))
 
         return keys_and_values
 
@@ -223,30 +534,49 @@ class HashMap:
         """
         Clear the contents of the HashMap.
         """
-        self._buckets = DynamicArray()
-        for _ in range(self._capacity):
-            self._buckets.append(None)
+        self._old_buckets = None
+        self._buckets.fill(None)
         self._size = 0
+        self._version += 1
+        self._tombstones = 0
 
     def __iter__(self):
         """
-        Method that allows hash map iteration on itself.
+        Method that allows hash map iteration on itself. Every call returns its own iterator, so
+        iterations can be nested.
         """
-        self._index = 0
-        return self
+        return self._entries()
 
-    def __next__(self):
+    def _entries(self):
         """
-        Return the next item in the hash map, based on the current location of the iterator.
+        Yield the live entries in the hash map one at a time. Raises RuntimeError if a key is added or
+        removed, or the table is rebuilt, before the walk is done.
         """
-        try:
-            value = None
-            while value is None or value.is_tombstone is True:
-                value = self._buckets[self._index]
-                self._index += 1
-        except DynamicArrayException:
-            raise StopIteration
-        return value
+        self._finish_rehash()
+        version = self._version
+        for entry in self._buckets:
+            if entry is not None and not entry.is_tombstone:
+                yield entry
+                if self._version != version:
+                    raise RuntimeError("hash map changed during iteration")
+
+    def keys(self):
+        """
+        Return a lazy iterator over the keys in the hash map.
+        """
+        return (entry.key for entry in self._entries())
+
+    def values(self):
+        """
+        Return a lazy iterator over the values in the hash map.
+        """
+        return (entry.value for entry in self._entries())
+
+    def items(self):
+        """
+        Return a lazy iterator over the (key, value) pairs in the hash map.
+        """
+        return ((entry.key, entry.value) for entry in self._entries())
 
 
 # ------------------- BASIC TESTING ---------------------------------------- #
@@ -457,3 +787,50 @@ if __name__ == "__main__":
     print(m)
     for item in m:
         print('K:', item.key, 'V:', item.value)
+
+    print("\nshrink example")
+    print("--------------")
+    m = HashMap(11, hash_function_2)
+    for i in range(200):
+        m.put(str(i), i)
+    print(m.get_size(), m.get_capacity())  # 200 797
+    for i in range(190):
+        m.remove(str(i))
+    print(m.get_size(), m.get_capacity(), m.get_tombstone_count())  # 10 53 3
+    m.shrink_to_fit()
+    print(m.get_size(), m.get_capacity(), m.get_tombstone_count(), m.get('195'))  # 10 23 0 195
+
+    print("\nincremental resize example")
+    print("--------------------------")
+    m = HashMap(11, hash_function_2, incremental=True)
+    for i in range(7):
+        m.put(str(i), i * 10)
+    # the last put started a resize, so the table printed has keys still waiting in the old one
+    print(m)
+    print(m.get_size(), m.get_capacity(), m.get('3'))  # 7 23 30
+    print(m.contains_key('6'), m.contains_key('7'))  # True False
+
+    print("\nput_many, get_many, remove_many example")
+    print("---------------------------------------")
+    m = HashMap(11, hash_function_1)
+    m.put_many((str(i), i * 10) for i in range(100))
+    print(m.get_size(), m.get_capacity())  # 100 211
+    print(m.get_many(['0', '42', '99', '100']))  # [0, 420, 990, None]
+    print(m.remove_many(['42', '42', '100']))  # [420, None, None]
+    print(m.get_size(), m.get_many(['42', '43']))  # 99 [None, 430]
+
+    print("\nkeys, values, items example")
+    print("---------------------------")
+    m = HashMap(11, hash_function_2)
+    for i in range(4):
+        m.put(str(i), i * 10)
+    print(list(m.keys()), list(m.values()))  # ['0', '1', '2', '3'] [0, 10, 20, 30]
+    # values may be updated during a walk, since that does not add or remove keys
+    for key, value in m.items():
+        m.put(key, value + 1)
+    print(list(m.items()))  # [('0', 1), ('1', 11), ('2', 21), ('3', 31)]
+    try:
+        for key in m.keys():
+            m.put('new' + key, 0)
+    except RuntimeError as error:
+        print('RuntimeError:', error)  # RuntimeError: hash map changed during iteration
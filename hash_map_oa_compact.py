@@ -0,0 +1,278 @@
+# Course: CS261 - Data Structures
+# Assignment: Portfolio Project - Assignment 6 - Hash Maps
+# Description: Open addressing hash map with the same quadratic probing, tombstones and public API as
+# hash_map_oa.py, but without an object per slot. Keys, values, cached hashes and slot states live in
+# parallel flat arrays: lists for keys and values, an array of unsigned 64-bit integers for the hashes
+# and a bytearray holding one state byte per slot.
+
+from array import array
+
+from a6_include import (DynamicArray, HashEntry,
+                        hash_function_1, hash_function_2, next_prime)
+
+# slot states
+EMPTY = 0
+LIVE = 1
+TOMBSTONE = 2
+
+# hashes are stored as unsigned 64-bit integers
+_HASH_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+class HashMap:
+    def __init__(self, capacity: int, function) -> None:
+        """
+        Initialize new HashMap that uses
+        quadratic probing for collision resolution
+        """
+        # capacity must be a prime number
+        self._capacity = next_prime(capacity)
+        self._allocate(self._capacity)
+
+        self._hash_function = function
+        self._size = 0
+        self._tombstones = 0
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Replace the slot arrays with empty ones of the given capacity
+        """
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = array('Q', bytes(8 * capacity))
+        self._states = bytearray(capacity)
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            if self._states[i] == EMPTY:
+                out += str(i) + ': None\n'
+            else:
+                is_tombstone = self._states[i] == TOMBSTONE
+                out += f"{i}: K: {self._keys[i]} V: {self._values[i]} TS: {is_tombstone}\n"
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Update the value of an existing key, or add the key-value pair to the hash map.
+
+        Table resizes are doubled from its capacity and the load factor is greater than or equal to 0.5.
+        When live entries and tombstones together fill 0.75 of the table, it is rehashed in place at
+        the same capacity to clear the tombstones out of the probe chains.
+        """
+        if self.table_load() >= 0.5:
+            self.resize_table(self._capacity * 2)
+        elif self.occupied_load() >= 0.75:
+            self.resize_table(self._capacity)
+
+        capacity, states = self._capacity, self._states
+        hash_value = self._hash_function(key) & _HASH_MASK
+        initial_index = hash_value % capacity
+        index = initial_index
+        tombstone_index = None
+
+        j = 0
+        while j < capacity:
+            state = states[index]
+            if state == EMPTY:
+                break
+
+            # remember the first tombstone, but keep probing in case the key lives further along
+            if state == TOMBSTONE:
+                if tombstone_index is None:
+                    tombstone_index = index
+
+            # replace existing value with new value
+            elif self._hashes[index] == hash_value and self._keys[index] == key:
+                self._values[index] = value
+                return
+
+            j += 1
+            index = (initial_index + j * j) % capacity
+
+        if tombstone_index is not None:
+            index = tombstone_index
+            self._tombstones -= 1
+        self._keys[index] = key
+        self._values[index] = value
+        self._hashes[index] = hash_value
+        states[index] = LIVE
+        self._size += 1
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Change the capacity of the hash table and move the live entries into it, dropping tombstones.
+        """
+        if new_capacity < self._size:
+            return
+
+        new_capacity = next_prime(new_capacity)
+        while self._size > 0 and (self._size - 1) * 2 >= new_capacity:
+            new_capacity = next_prime(new_capacity * 2)
+
+        old_keys, old_values, old_hashes, old_states = self._keys, self._values, self._hashes, self._states
+        self._allocate(new_capacity)
+        self._capacity = new_capacity
+        keys, values, hashes, states = self._keys, self._values, self._hashes, self._states
+
+        for old_index in range(len(old_states)):
+            if old_states[old_index] != LIVE:
+                continue
+
+            hash_value = old_hashes[old_index]
+            initial_index = hash_value % new_capacity
+            index = initial_index
+            j = 0
+            while states[index] != EMPTY:
+                j += 1
+                index = (initial_index + j * j) % new_capacity
+
+            keys[index] = old_keys[old_index]
+            values[index] = old_values[old_index]
+            hashes[index] = hash_value
+            states[index] = LIVE
+
+        self._tombstones = 0
+
+    def table_load(self) -> float:
+        """
+        Return the load factor of the hash table.
+        """
+        return self._size / self._capacity
+
+    def occupied_load(self) -> float:
+        """
+        Return the fraction of buckets holding either a live entry or a tombstone.
+        """
+        return (self._size + self._tombstones) / self._capacity
+
+    def get_tombstone_count(self) -> int:
+        """
+        Return the number of tombstones currently left in the hash table.
+        """
+        return self._tombstones
+
+    def empty_buckets(self) -> int:
+        """
+        Return the number of empty buckets in the hash table. Tombstones are not empty.
+        """
+        return self._capacity - self._size - self._tombstones
+
+    def _find_index(self, key: str):
+        """
+        Follow the quadratic probe sequence for the given key and return the index of its live entry,
+        or None once an empty bucket ends the sequence.
+        """
+        capacity, states = self._capacity, self._states
+        hash_value = self._hash_function(key) & _HASH_MASK
+        initial_index = hash_value % capacity
+        index = initial_index
+
+        j = 0
+        while j < capacity:
+            state = states[index]
+            if state == EMPTY:
+                return None
+            if state == LIVE and self._hashes[index] == hash_value and self._keys[index] == key:
+                return index
+            j += 1
+            index = (initial_index + j * j) % capacity
+        return None
+
+    def get(self, key: str) -> object:
+        """
+        Return the value associated with the given key. Return None if the key is not in the hash map.
+        """
+        index = self._find_index(key)
+        if index is None:
+            return None
+        return self._values[index]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Return True if the given key is in the hash map, and return False otherwise.
+        """
+        return self._find_index(key) is not None
+
+    def remove(self, key: str) -> None:
+        """
+        Remove the given key and its associated value from the hash map. Do nothing if the key is not in
+        the hash map. The key and value references are dropped right away; only the state byte remains.
+        """
+        index = self._find_index(key)
+        if index is not None:
+            self._keys[index] = None
+            self._values[index] = None
+            self._states[index] = TOMBSTONE
+            self._size -= 1
+            self._tombstones += 1
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Return a dynamic array of tuple key-value pairs within the hash map in any key order.
+        """
+        keys_and_values = DynamicArray()
+        keys, values, states = self._keys, self._values, self._states
+        for index in range(self._capacity):
+            if states[index] == LIVE:
+                keys_and_values.append((keys[index], values[index]))
+        return keys_and_values
+
+    def clear(self) -> None:
+        """
+        Clear the contents of the HashMap without changing its capacity.
+        """
+        self._allocate(self._capacity)
+        self._size = 0
+        self._tombstones = 0
+
+    def __iter__(self):
+        """
+        Return an iterator over the live entries. There are no stored entry objects, so each one is
+        yielded as a fresh HashEntry to keep the interface of hash_map_oa.HashMap.
+        """
+        keys, values, hashes, states = self._keys, self._values, self._hashes, self._states
+        for index in range(self._capacity):
+            if states[index] == LIVE:
+                yield HashEntry(keys[index], values[index], hashes[index])
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput example")
+    print("-----------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\niterator example")
+    print("----------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    print(m)
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
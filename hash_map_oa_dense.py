@@ -0,0 +1,330 @@
+# Course: CS261 - Data Structures
+# Assignment: Portfolio Project - Assignment 6 - Hash Maps
+# Description: Open addressing hash map with the same quadratic probing, tombstones and public API as
+# hash_map_oa.py, laid out like CPython's compact dict. The probed table only holds small integers that
+# index into dense arrays of hashes, keys and values kept in insertion order. Iteration, export and
+# resizing walk the dense arrays, so they touch live entries only and follow insertion order.
+
+from array import array
+from itertools import compress
+
+from a6_include import (DynamicArray, HashEntry,
+                        hash_function_1, hash_function_2, next_prime)
+
+# index table markers -- any other value is a position in the entry arrays
+EMPTY = -1
+DUMMY = -2
+
+# stands in for the key of a removed entry until the entry arrays are compacted
+_DELETED = object()
+
+# hashes are stored as unsigned 64-bit integers
+_HASH_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+def _new_index(capacity: int) -> array:
+    """
+    Return an index table of the given capacity with every slot EMPTY, using the smallest signed
+    integer type that holds every entry position the table can point at
+    """
+    if capacity < 1 << 7:
+        typecode = 'b'
+    elif capacity < 1 << 15:
+        typecode = 'h'
+    elif capacity < 1 << 31:
+        typecode = 'i'
+    else:
+        typecode = 'q'
+    return array(typecode, [EMPTY]) * capacity
+
+
+class HashMap:
+    def __init__(self, capacity: int, function) -> None:
+        """
+        Initialize new HashMap that uses
+        quadratic probing for collision resolution
+        """
+        # capacity must be a prime number
+        self._capacity = next_prime(capacity)
+        self._indices = _new_index(self._capacity)
+        self._hashes = array('Q')
+        self._keys = []
+        self._values = []
+
+        self._hash_function = function
+        self._size = 0
+        self._tombstones = 0
+
+        # bumped whenever a key is added or removed or the table is rebuilt, so iterators can tell
+        self._version = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i, position in enumerate(self._indices):
+            if position == EMPTY:
+                out += str(i) + ': None\n'
+            elif position == DUMMY:
+                out += str(i) + ': K: None V: None TS: True\n'
+            else:
+                out += f"{i}: K: {self._keys[position]} V: {self._values[position]} TS: False\n"
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Update the value of an existing key, or add the key-value pair to the hash map. A new key goes
+        to the end of the insertion order; updating a key keeps its place.
+
+        Table resizes are doubled from its capacity and the load factor is greater than or equal to 0.5.
+        When the entry arrays, removed entries included, reach 0.75 of the capacity, the table is rebuilt
+        at the same capacity to drop them along with the tombstones they left in the index table.
+        """
+        if self.table_load() >= 0.5:
+            self.resize_table(self._capacity * 2)
+        elif len(self._keys) >= self._capacity * 0.75:
+            self.resize_table(self._capacity)
+
+        capacity, indices = self._capacity, self._indices
+        hash_value = self._hash_function(key) & _HASH_MASK
+        initial_index = hash_value % capacity
+        index = initial_index
+        tombstone_index = None
+
+        j = 0
+        while j < capacity:
+            position = indices[index]
+            if position == EMPTY:
+                break
+
+            # remember the first tombstone, but keep probing in case the key lives further along
+            if position == DUMMY:
+                if tombstone_index is None:
+                    tombstone_index = index
+
+            # replace existing value with new value
+            elif self._hashes[position] == hash_value and self._keys[position] == key:
+                self._values[position] = value
+                return
+
+            j += 1
+            index = (initial_index + j * j) % capacity
+
+        if tombstone_index is not None:
+            index = tombstone_index
+            self._tombstones -= 1
+        indices[index] = len(self._keys)
+        self._hashes.append(hash_value)
+        self._keys.append(key)
+        self._values.append(value)
+        self._size += 1
+        self._version += 1
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Change the capacity of the hash table and rebuild the index table over the live entries. Removed
+        entries are dropped from the entry arrays; the rest keep their insertion order.
+        """
+        if new_capacity < self._size:
+            return
+
+        new_capacity = next_prime(new_capacity)
+        while self._size > 0 and (self._size - 1) * 2 >= new_capacity:
+            new_capacity = next_prime(new_capacity * 2)
+
+        if len(self._keys) != self._size:
+            live = [key is not _DELETED for key in self._keys]
+            self._hashes = array('Q', compress(self._hashes, live))
+            self._keys = list(compress(self._keys, live))
+            self._values = list(compress(self._values, live))
+
+        # every key is unique and the new table has no tombstones, so each position only needs the
+        # first empty slot along its probe sequence
+        indices = _new_index(new_capacity)
+        for position, hash_value in enumerate(self._hashes):
+            initial_index = hash_value % new_capacity
+            index = initial_index
+            j = 0
+            while indices[index] != EMPTY:
+                j += 1
+                index = (initial_index + j * j) % new_capacity
+            indices[index] = position
+
+        self._indices = indices
+        self._capacity = new_capacity
+        self._tombstones = 0
+        self._version += 1
+
+    def table_load(self) -> float:
+        """
+        Return the load factor of the hash table.
+        """
+        return self._size / self._capacity
+
+    def occupied_load(self) -> float:
+        """
+        Return the fraction of index table slots holding either a live entry or a tombstone.
+        """
+        return (self._size + self._tombstones) / self._capacity
+
+    def get_tombstone_count(self) -> int:
+        """
+        Return the number of tombstones currently left in the index table.
+        """
+        return self._tombstones
+
+    def empty_buckets(self) -> int:
+        """
+        Return the number of empty buckets in the hash table. Tombstones are not empty.
+        """
+        return self._capacity - self._size - self._tombstones
+
+    def _find_index(self, key: str):
+        """
+        Follow the quadratic probe sequence for the given key and return the index table slot that
+        points at its entry, or None once an empty slot ends the sequence.
+        """
+        capacity, indices = self._capacity, self._indices
+        hash_value = self._hash_function(key) & _HASH_MASK
+        initial_index = hash_value % capacity
+        index = initial_index
+
+        j = 0
+        while j < capacity:
+            position = indices[index]
+            if position == EMPTY:
+                return None
+            if position != DUMMY and self._hashes[position] == hash_value and self._keys[position] == key:
+                return index
+            j += 1
+            index = (initial_index + j * j) % capacity
+        return None
+
+    def get(self, key: str) -> object:
+        """
+        Return the value associated with the given key. Return None if the key is not in the hash map.
+        """
+        index = self._find_index(key)
+        if index is None:
+            return None
+        return self._values[self._indices[index]]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Return True if the given key is in the hash map, and return False otherwise.
+        """
+        return self._find_index(key) is not None
+
+    def remove(self, key: str) -> None:
+        """
+        Remove the given key and its associated value from the hash map. Do nothing if the key is not in
+        the hash map. The index slot becomes a tombstone and the entry is marked removed until the next
+        resize compacts the entry arrays.
+        """
+        index = self._find_index(key)
+        if index is not None:
+            position = self._indices[index]
+            self._indices[index] = DUMMY
+            self._keys[position] = _DELETED
+            self._values[position] = None
+            self._size -= 1
+            self._tombstones += 1
+            self._version += 1
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Return a dynamic array of tuple key-value pairs within the hash map in insertion order.
+        """
+        return DynamicArray([(key, value) for key, value in zip(self._keys, self._values)
+                             if key is not _DELETED])
+
+    def clear(self) -> None:
+        """
+        Clear the contents of the HashMap without changing its capacity.
+        """
+        self._indices = _new_index(self._capacity)
+        self._hashes = array('Q')
+        self._keys = []
+        self._values = []
+        self._size = 0
+        self._tombstones = 0
+        self._version += 1
+
+    def _positions(self):
+        """
+        Yield the position of every live entry, in insertion order. Raises RuntimeError if a key is
+        added or removed, or the table is rebuilt, before the walk is done.
+        """
+        version = self._version
+        keys = self._keys
+        for position in range(len(keys)):
+            if keys[position] is not _DELETED:
+                yield position
+                if self._version != version:
+                    raise RuntimeError("hash map changed during iteration")
+
+    def __iter__(self):
+        """
+        Return an iterator over the live entries in insertion order. There are no stored entry objects,
+        so each one is yielded as a fresh HashEntry to keep the interface of hash_map_oa.HashMap.
+        """
+        return (HashEntry(self._keys[position], self._values[position], self._hashes[position])
+                for position in self._positions())
+
+    def keys(self):
+        """
+        Return a lazy iterator over the keys in the hash map, in insertion order.
+        """
+        return (self._keys[position] for position in self._positions())
+
+    def values(self):
+        """
+        Return a lazy iterator over the values in the hash map, in insertion order.
+        """
+        return (self._values[position] for position in self._positions())
+
+    def items(self):
+        """
+        Return a lazy iterator over the (key, value) pairs in the hash map, in insertion order.
+        """
+        return ((self._keys[position], self._values[position]) for position in self._positions())
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput example")
+    print("-----------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\niterator example")
+    print("----------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    m.put('0', 'back')
+    print(m)
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
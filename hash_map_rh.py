@@ -0,0 +1,265 @@
+# Course: CS261 - Data Structures
+# Assignment: Portfolio Project - Assignment 6 - Hash Maps
+# Description: Open addressing hash map using Robin Hood linear probing. Entries that are further from
+# their home bucket take slots from entries that are closer to theirs, which keeps probe lengths short
+# and even, so the table can run at load factors of 0.75 and up. Removal shifts the following entries
+# back instead of leaving tombstones. Same public API as the quadratic probing map in hash_map_oa.py.
+# The buckets are a plain list, walked with the table bound to locals, since every lookup probes several.
+
+from a6_include import (DynamicArray, HashEntry,
+                        hash_function_1, hash_function_2, next_prime)
+
+
+class HashMap:
+    def __init__(self, capacity: int, function, max_load: float = 0.75) -> None:
+        """
+        Initialize new HashMap that uses Robin Hood linear probing
+        for collision resolution. max_load must be below 1.0 so that every probe
+        sequence ends at an empty bucket.
+
+        At the default max_load of 0.75 a lookup takes about 2.5 probes, and costs about the same as
+        in the quadratic probing map at its 0.5. Raising max_load to 0.9 saves a sixth of the buckets,
+        but lookups then take about 5 probes and run about twice as slow.
+        """
+        if not 0 < max_load < 1:
+            raise ValueError("max_load must be between 0 and 1")
+
+        # capacity must be a prime number
+        self._capacity = next_prime(capacity)
+        self._buckets = [None] * self._capacity
+
+        self._hash_function = function
+        self._max_load = max_load
+        self._size = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i, entry in enumerate(self._buckets):
+            out += str(i) + ': ' + str(entry) + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _place(self, entry: HashEntry, index: int, distance: int) -> None:
+        """
+        Store an entry whose key is known not to be in the table, starting at the given index and
+        probe distance. Whenever a resident entry is closer to its home bucket than the carried
+        one, they swap and the resident continues down the table.
+        """
+        buckets, capacity = self._buckets, self._capacity
+        while True:
+            current = buckets[index]
+            if current is None:
+                buckets[index] = entry
+                return
+
+            # how many buckets past its home bucket the resident sits
+            current_distance = (index - current.hash) % capacity
+            if current_distance < distance:
+                buckets[index] = entry
+                entry, distance = current, current_distance
+
+            index += 1
+            if index == capacity:
+                index = 0
+            distance += 1
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Update the value of an existing key, or add the key-value pair to the hash map.
+
+        The table doubles in capacity when adding the pair would take the load factor past max_load.
+        """
+        if (self._size + 1) / self._capacity > self._max_load:
+            self.resize_table(self._capacity * 2)
+
+        buckets, capacity = self._buckets, self._capacity
+        hash_value = self._hash_function(key)
+        index = hash_value % capacity
+        distance = 0
+
+        # search until the key is found, or an entry closer to home proves it is absent
+        while True:
+            current = buckets[index]
+            if current is None:
+                break
+            current_hash = current.hash
+            if current_hash == hash_value and current.key == key:
+                current.value = value
+                return
+            if (index - current_hash) % capacity < distance:
+                break
+            index += 1
+            if index == capacity:
+                index = 0
+            distance += 1
+
+        self._place(HashEntry(key, value, hash_value), index, distance)
+        self._size += 1
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Change the capacity of the hash table and rehash the existing entries into it. The capacity
+        is rounded up to a prime number, and doubled further if needed to stay within max_load.
+        """
+        if new_capacity < self._size:
+            return
+
+        new_capacity = next_prime(new_capacity)
+        while self._size > new_capacity * self._max_load:
+            new_capacity = next_prime(new_capacity * 2)
+
+        old_buckets = self._buckets
+        self._buckets = [None] * new_capacity
+        self._capacity = new_capacity
+
+        for entry in old_buckets:
+            if entry is not None:
+                self._place(entry, entry.hash % new_capacity, 0)
+
+    def table_load(self) -> float:
+        """
+        Return the current hash table load factor.
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Return the number of empty buckets in the hash table.
+        """
+        return self._capacity - self._size
+
+    def _find_index(self, key: str):
+        """
+        Return the index of the entry holding the given key, or None if the key is not in the hash map.
+        """
+        buckets, capacity = self._buckets, self._capacity
+        hash_value = self._hash_function(key)
+        index = hash_value % capacity
+        distance = 0
+
+        while True:
+            current = buckets[index]
+            if current is None:
+                return None
+            current_hash = current.hash
+            if current_hash == hash_value and current.key == key:
+                return index
+            if (index - current_hash) % capacity < distance:
+                return None
+            index += 1
+            if index == capacity:
+                index = 0
+            distance += 1
+
+    def get(self, key: str) -> object:
+        """
+        Return the value associated with the given key. Return None if the key is not in the hash map.
+        """
+        index = self._find_index(key)
+        if index is None:
+            return None
+        return self._buckets[index].value
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Return True if the given key is in the hash map, and return False otherwise.
+        """
+        return self._find_index(key) is not None
+
+    def remove(self, key: str) -> None:
+        """
+        Remove the given key and its associated value from the hash map. Do nothing if the key is not in
+        the hash map. The entries after it shift back one bucket until one is already at home.
+        """
+        index = self._find_index(key)
+        if index is None:
+            return
+
+        buckets, capacity = self._buckets, self._capacity
+        next_index = (index + 1) % capacity
+        while True:
+            entry = buckets[next_index]
+            if entry is None or entry.hash % capacity == next_index:
+                break
+            buckets[index] = entry
+            index, next_index = next_index, (next_index + 1) % capacity
+
+        buckets[index] = None
+        self._size -= 1
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Return a dynamic array of tuple key-value pairs within the hash map in any key order.
+        """
+        keys_and_values = DynamicArray()
+        for entry in self:
+            keys_and_values.append((entry.key, entry.value))
+        return keys_and_values
+
+    def clear(self) -> None:
+        """
+        Clear the contents of the HashMap without changing its capacity.
+        """
+        self._buckets = [None] * self._capacity
+        self._size = 0
+
+    def __iter__(self):
+        """
+        Return an iterator over the entries in the hash map.
+        """
+        for entry in self._buckets:
+            if entry is not None:
+                yield entry
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput example")
+    print("-----------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nremove example")
+    print("--------------")
+    m = HashMap(79, hash_function_2)
+    keys = [i for i in range(1, 1000, 20)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    for key in keys[::2]:
+        m.remove(str(key))
+    result = True
+    for index, key in enumerate(keys):
+        result &= m.contains_key(str(key)) == (index % 2 == 1)
+    print(result, m.get_size(), m.get_capacity())
+
+    print("\niterator example")
+    print("----------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    print(m)
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
@@ -0,0 +1,219 @@
+# Course: CS261 - Data Structures
+# Assignment: Portfolio Project - Assignment 6 - Hash Maps
+# Description: Separate chaining hash map with the same public API as hash_map_sc.py, where each bucket
+# is one flat Python list of [hash, key, value, hash, key, value, ...] instead of a linked list of
+# SLNodes. Every empty bucket refers to the same shared empty tuple, so an empty table holds no
+# per-bucket objects at all.
+
+from a6_include import (DynamicArray, hash_function_1, hash_function_2, is_prime, next_prime)
+
+# shared by every empty bucket
+EMPTY_BUCKET = ()
+
+# each entry takes three consecutive slots of its bucket: hash, key, value
+_STRIDE = 3
+
+
+class HashMap:
+    def __init__(self,
+                 capacity: int = 11,
+                 function: callable = hash_function_1) -> None:
+        """
+        Initialize new HashMap that uses
+        separate chaining for collision resolution
+        """
+        # capacity must be a prime number
+        self._capacity = next_prime(capacity)
+        self._buckets = DynamicArray(length=self._capacity, fill=EMPTY_BUCKET)
+
+        self._hash_function = function
+        self._size = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i, bucket in enumerate(self._buckets):
+            pairs = [f"({bucket[j + 1]}: {bucket[j + 2]})" for j in range(0, len(bucket), _STRIDE)]
+            out += str(i) + ': [' + ' -> '.join(pairs) + ']\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _find(bucket, hash_value: int, key: str) -> int:
+        """
+        Return the position of the key's hash slot within the bucket, or -1 if the key is not there
+        """
+        for position in range(0, len(bucket), _STRIDE):
+            if bucket[position] == hash_value and bucket[position + 1] == key:
+                return position
+        return -1
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Update the value of an existing key, or add the key-value pair to the hash map.
+
+        Table resizes are doubled from its capacity and the load factor is greater than or equal to 1.0.
+        """
+        if self._size >= self._capacity:
+            self.resize_table(self._capacity * 2)
+
+        hash_value = self._hash_function(key)
+        index = hash_value % self._capacity
+        bucket = self._buckets[index]
+
+        position = self._find(bucket, hash_value, key)
+        if position >= 0:
+            bucket[position + 2] = value
+            return
+
+        if bucket is EMPTY_BUCKET:
+            self._buckets[index] = [hash_value, key, value]
+        else:
+            bucket.extend((hash_value, key, value))
+        self._size += 1
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Change the capacity of the hash table and move the existing entries into it. The capacity is
+        rounded up to a prime number, and doubled further while it is below the number of keys.
+        """
+        if new_capacity < 1:
+            return
+        if not is_prime(new_capacity):
+            new_capacity = next_prime(new_capacity)
+
+        # grow the same way re-inserting every key with put() would have
+        while self._size > new_capacity:
+            new_capacity = next_prime(new_capacity * 2)
+
+        old_buckets = self._buckets
+        self._buckets = DynamicArray(length=new_capacity, fill=EMPTY_BUCKET)
+        self._capacity = new_capacity
+        buckets = self._buckets
+
+        for old_bucket in old_buckets:
+            for position in range(0, len(old_bucket), _STRIDE):
+                hash_value = old_bucket[position]
+                index = hash_value % new_capacity
+                bucket = buckets[index]
+                if bucket is EMPTY_BUCKET:
+                    buckets[index] = old_bucket[position:position + _STRIDE]
+                else:
+                    bucket.extend(old_bucket[position:position + _STRIDE])
+
+    def table_load(self) -> float:
+        """
+        Return the current hash table load factor.
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Return the number of empty buckets in the hash table.
+        """
+        count = 0
+        for bucket in self._buckets:
+            if not bucket:
+                count += 1
+        return count
+
+    def get(self, key: str):
+        """
+        Return the value associated with the given key, or None if the key is not in the hash map.
+        """
+        hash_value = self._hash_function(key)
+        bucket = self._buckets[hash_value % self._capacity]
+        position = self._find(bucket, hash_value, key)
+        if position < 0:
+            return None
+        return bucket[position + 2]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Return True if the given key is in the hash map, and return False otherwise.
+        """
+        hash_value = self._hash_function(key)
+        return self._find(self._buckets[hash_value % self._capacity], hash_value, key) >= 0
+
+    def remove(self, key: str) -> object:
+        """
+        Remove the given key-value pair from the hash map and return the removed value, or None if
+        the key is not in the hash map.
+        """
+        return self.pop(key)
+
+    def pop(self, key: str, default: object = None) -> object:
+        """
+        Remove the given key from the hash map and return its value. Return default if the key is not
+        in the hash map. A bucket left with no entries goes back to the shared empty bucket.
+        """
+        hash_value = self._hash_function(key)
+        index = hash_value % self._capacity
+        bucket = self._buckets[index]
+        position = self._find(bucket, hash_value, key)
+        if position < 0:
+            return default
+
+        value = bucket[position + 2]
+        if len(bucket) == _STRIDE:
+            self._buckets[index] = EMPTY_BUCKET
+        else:
+            del bucket[position:position + _STRIDE]
+        self._size -= 1
+        return value
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Create a new DynamicArray object where each index contains a tuple of
+        all key/value pair stored in a HashMap.
+        """
+        keys_and_values = DynamicArray()
+        for bucket in self._buckets:
+            for position in range(0, len(bucket), _STRIDE):
+                keys_and_values.append((bucket[position + 1], bucket[position + 2]))
+        return keys_and_values
+
+    def clear(self) -> None:
+        """
+        Clear the contents of the hash map but do not change the underlying hash table capacity.
+        """
+        self._buckets.fill(EMPTY_BUCKET)
+        self._size = 0
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput example")
+    print("-----------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nget_keys_and_values example")
+    print("---------------------------")
+    m = HashMap(11, hash_function_2)
+    for i in range(1, 6):
+        m.put(str(i), str(i * 10))
+    m.put('20', '200')
+    m.remove('1')
+    m.resize_table(2)
+    print(m.get_keys_and_values())